@@ -0,0 +1,113 @@
+"""Бенчмарк сериализации кэша: pickle ORM объектов против кодеков по схеме.
+
+Запуск (бд и redis не нужны):
+    python -m benchmarks.cache_codecs
+"""
+
+import pickle
+import timeit
+from decimal import Decimal
+from typing import Any
+from uuid import UUID, uuid4
+
+from pydantic import TypeAdapter
+
+from src.caching.cache_repo import (
+    DISH_SCHEMA,
+    DISHES_SCHEMA,
+    MENU_SCHEMA,
+    MENUS_SCHEMA,
+    MENUS_TREE_SCHEMA,
+    SUBMENU_SCHEMA,
+)
+from src.caching.codecs import CODECS
+from src.model_definitions.models import Dish, Menu, SubMenu
+
+MENUS = 10
+SUBMENUS_PER_MENU = 10
+DISHES_PER_SUBMENU = 20
+NUMBER = 20
+
+
+def build_dish(submenu_id: UUID, d: int) -> Dish:
+    """Блюдо, как после загрузки из бд"""
+    return Dish(
+        id=uuid4(),
+        title=f'bench dish {d}',
+        description='bench',
+        price=Decimal('9.99'),
+        submenu_id=submenu_id,
+    )
+
+
+def build_submenu(menu_id: UUID, s: int, with_dishes: bool) -> SubMenu:
+    """Подменю, как после загрузки из бд, с блюдами или без"""
+    submenu = SubMenu(
+        id=uuid4(), title=f'bench submenu {s}', description='bench', menu_id=menu_id
+    )
+    submenu.dishes_count = DISHES_PER_SUBMENU
+    if with_dishes:
+        submenu.dishes = [
+            build_dish(submenu.id, d) for d in range(DISHES_PER_SUBMENU)
+        ]
+    return submenu
+
+
+def build_menu(m: int, with_submenus: bool) -> Menu:
+    """Меню, как после загрузки из бд, с подменю и блюдами или без"""
+    menu = Menu(id=uuid4(), title=f'bench menu {m}', description='bench')
+    menu.submenus_count = SUBMENUS_PER_MENU
+    menu.dishes_count = SUBMENUS_PER_MENU * DISHES_PER_SUBMENU
+    if with_submenus:
+        menu.submenus = [
+            build_submenu(menu.id, s, with_dishes=True)
+            for s in range(SUBMENUS_PER_MENU)
+        ]
+    return menu
+
+
+def measure(encode, decode) -> tuple[float, float, int]:
+    """Время сериализации и десериализации (мкс) и размер значения (байт)"""
+    data = encode()
+    encode_time = timeit.timeit(encode, number=NUMBER) / NUMBER * 1e6
+    decode_time = timeit.timeit(lambda: decode(data), number=NUMBER) / NUMBER * 1e6
+    return encode_time, decode_time, len(data)
+
+
+def main() -> None:
+    menus = [build_menu(m, with_submenus=False) for m in range(MENUS)]
+    menus_tree = [build_menu(m, with_submenus=True) for m in range(MENUS)]
+    submenu_id = uuid4()
+    dishes = [build_dish(submenu_id, d) for d in range(DISHES_PER_SUBMENU)]
+    entities: dict[str, tuple[Any, TypeAdapter]] = {
+        'menu': (menus[0], MENU_SCHEMA),
+        'menus': (menus, MENUS_SCHEMA),
+        'submenu': (build_submenu(uuid4(), 0, with_dishes=False), SUBMENU_SCHEMA),
+        'dish': (dishes[0], DISH_SCHEMA),
+        'dishes': (dishes, DISHES_SCHEMA),
+        'menus_tree': (menus_tree, MENUS_TREE_SCHEMA),
+    }
+    print(
+        f'{"entity":>10} | {"codec":>7} | {"encode, us":>11} | '
+        f'{"decode, us":>11} | {"bytes":>8}'
+    )
+    for name, (value, schema) in entities.items():
+        results = {
+            'pickle': measure(lambda: pickle.dumps(value), pickle.loads),
+            **{
+                codec_name: measure(
+                    lambda codec=codec: codec.encode(value, schema),
+                    lambda data, codec=codec: codec.decode(data, schema),
+                )
+                for codec_name, codec in CODECS.items()
+            },
+        }
+        for codec_name, (encode_time, decode_time, size) in results.items():
+            print(
+                f'{name:>10} | {codec_name:>7} | {encode_time:>11.1f} | '
+                f'{decode_time:>11.1f} | {size:>8}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Бенчмарк сжатия кэша menus_tree: размер и время сжатия по размеру дерева.
+
+Запуск (бд и redis не нужны):
+    python -m benchmarks.cache_compression
+"""
+
+import timeit
+import zlib
+from uuid import uuid4
+
+from src.caching.cache_repo import MENUS_TREE_SCHEMA
+from src.caching.codecs import CODECS
+
+DISHES = (1_000, 10_000, 100_000)
+DISHES_PER_SUBMENU = 20
+SUBMENUS_PER_MENU = 10
+LEVELS = (1, 6)
+NUMBER = 5
+
+
+def build_menus_tree(dishes: int) -> list[dict]:
+    """Дерево меню с заданным числом блюд"""
+    submenus = dishes // DISHES_PER_SUBMENU
+    menus = []
+    for m in range(max(submenus // SUBMENUS_PER_MENU, 1)):
+        menu_id = uuid4()
+        menu_submenus = []
+        for s in range(SUBMENUS_PER_MENU):
+            submenu_id = uuid4()
+            menu_submenus.append(
+                {
+                    'id': submenu_id,
+                    'title': f'bench submenu {s}',
+                    'description': 'bench submenu description',
+                    'dishes_count': DISHES_PER_SUBMENU,
+                    'menu_id': menu_id,
+                    'dishes': [
+                        {
+                            'id': uuid4(),
+                            'title': f'bench dish {d}',
+                            'description': 'bench dish description',
+                            'price': 9.99,
+                            'submenu_id': submenu_id,
+                        }
+                        for d in range(DISHES_PER_SUBMENU)
+                    ],
+                }
+            )
+        menus.append(
+            {
+                'id': menu_id,
+                'title': f'bench menu {m}',
+                'description': 'bench menu description',
+                'submenus_count': SUBMENUS_PER_MENU,
+                'dishes_count': SUBMENUS_PER_MENU * DISHES_PER_SUBMENU,
+                'submenus': menu_submenus,
+            }
+        )
+    return menus
+
+
+def main() -> None:
+    print(
+        f'{"dishes":>7} | {"codec":>7} | {"level":>5} | {"raw":>9} | '
+        f'{"stored":>9} | {"compress, ms":>12} | {"decompress, ms":>14}'
+    )
+    for dishes in DISHES:
+        menus_tree = build_menus_tree(dishes)
+        for codec_name, codec in CODECS.items():
+            data = codec.encode(menus_tree, MENUS_TREE_SCHEMA)
+            for level in LEVELS:
+                compressed = zlib.compress(data, level)
+                compress_time = timeit.timeit(
+                    lambda: zlib.compress(data, level), number=NUMBER
+                )
+                decompress_time = timeit.timeit(
+                    lambda: zlib.decompress(compressed), number=NUMBER
+                )
+                print(
+                    f'{dishes:>7} | {codec_name:>7} | {level:>5} | {len(data):>9} | '
+                    f'{len(compressed):>9} | {compress_time / NUMBER * 1000:>12.2f} | '
+                    f'{decompress_time / NUMBER * 1000:>14.2f}'
+                )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Бенчмарк инвалидации кэша меню: KEYS по маске против версий.
+
+Запуск (нужен доступный redis из .env, используется база 15):
+    python -m benchmarks.cache_invalidation
+"""
+
+import asyncio
+import statistics
+import time
+from uuid import UUID, uuid4
+
+from fastapi import BackgroundTasks
+from pydantic import TypeAdapter
+from redis.asyncio import Redis
+
+from src.caching.cache_repo import MENU_KEY, MENU_VERSION_KEY, CacheRepo
+from src.caching.policy import MENUS
+from src.config import REDIS_URL
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+ENTRIES_PER_MENU = 50
+ROUNDS = 20
+BATCH = 10_000
+ENTRY_SCHEMA = TypeAdapter(int)
+
+
+async def fill_keyspace(redis: Redis, size: int) -> None:
+    """Заполнение redis посторонними ключами"""
+    await redis.flushdb()
+    for start in range(0, size, BATCH):
+        async with redis.pipeline(transaction=False) as pipe:
+            for i in range(start, min(start + BATCH, size)):
+                pipe.set(f'filler/{i}', b'x')
+            await pipe.execute()
+
+
+async def fill_menu(repo: CacheRepo, menu_id: UUID) -> None:
+    """Добавление кэша для всех эндпойнтов одного меню"""
+    for i in range(ENTRIES_PER_MENU):
+        await repo.set_cache(
+            MENU_KEY.format(menu_id) + f'/entry/{i}',
+            i,
+            MENUS,
+            ENTRY_SCHEMA,
+            MENU_VERSION_KEY.format(menu_id),
+        )
+
+
+async def delete_by_mask(redis: Redis, pattern: str) -> None:
+    """Прежняя реализация инвалидации через KEYS"""
+    for key in await redis.keys(pattern + '*'):
+        await redis.delete(key)
+
+
+async def measure(repo: CacheRepo, use_versions: bool) -> float:
+    """Медианное время инвалидации одного меню в миллисекундах"""
+    timings = []
+    for _ in range(ROUNDS):
+        menu_id = uuid4()
+        await fill_menu(repo, menu_id)
+        start = time.perf_counter()
+        if use_versions:
+            repo.invalidate_menu_tree_cache(menu_id)
+            await repo.flush_invalidations()
+        else:
+            await delete_by_mask(repo.redis, MENU_KEY.format(menu_id))
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+async def main() -> None:
+    redis = Redis.from_url(f'{REDIS_URL}/15')
+    repo = CacheRepo(BackgroundTasks(), redis)
+    print(f'{"keys":>10} | {"KEYS mask, ms":>14} | {"versions, ms":>13}')
+    for size in SIZES:
+        await fill_keyspace(redis, size)
+        by_mask = await measure(repo, use_versions=False)
+        by_version = await measure(repo, use_versions=True)
+        print(f'{size:>10} | {by_mask:>14.3f} | {by_version:>13.3f}')
+    await redis.flushdb()
+    await redis.aclose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+"""Бенчмарк выгрузки каталога: дерево меню целиком против потокового NDJSON.
+
+Для дерева меню первый байт доступен только после загрузки и сериализации
+всего ответа, выгрузка отдает первую пачку строк сразу. Пик памяти
+измеряется tracemalloc отдельным проходом.
+Запуск (нужны доступные postgres и redis из .env):
+    python -m benchmarks.catalog_export
+"""
+
+import asyncio
+import time
+import tracemalloc
+from collections.abc import AsyncIterator, Callable
+
+from fastapi import BackgroundTasks
+from pydantic import TypeAdapter
+from sqlalchemy import delete, insert, select
+
+from src.api.menu.crud_repo import MenuCRUDRepo
+from src.api.menu.service_repo import MenuServiceRepo
+from src.caching.cache_repo import CacheRepo
+from src.database import async_session_maker, get_redis
+from src.model_definitions.models import Dish, Menu, SubMenu
+from src.schemas.menus_tree_schemas import MenusTreeMenuOutput
+
+MENUS = 50
+SUBMENUS_PER_MENU = 20
+CATALOG_SIZES = (10, 100)
+
+MENUS_TREE_SCHEMA = TypeAdapter(list[MenusTreeMenuOutput])
+
+Export = Callable[[MenuServiceRepo], AsyncIterator[bytes]]
+
+
+async def seed(dishes_per_submenu: int) -> list:
+    """Заполнение бд каталогом с dishes_per_submenu блюд в каждом подменю"""
+    async with async_session_maker() as session:
+        menu_ids = (
+            await session.scalars(
+                insert(Menu).returning(Menu.id),
+                [
+                    {'title': f'bench menu {m}', 'description': 'bench'}
+                    for m in range(MENUS)
+                ],
+            )
+        ).all()
+        submenu_ids = (
+            await session.scalars(
+                insert(SubMenu).returning(SubMenu.id),
+                [
+                    {
+                        'title': f'bench submenu {s}',
+                        'description': 'bench',
+                        'menu_id': menu_id,
+                    }
+                    for menu_id in menu_ids
+                    for s in range(SUBMENUS_PER_MENU)
+                ],
+            )
+        ).all()
+        await session.execute(
+            insert(Dish),
+            [
+                {
+                    'title': f'bench dish {d}',
+                    'description': 'bench',
+                    'price': 9.99,
+                    'submenu_id': submenu_id,
+                }
+                for submenu_id in submenu_ids
+                for d in range(dishes_per_submenu)
+            ],
+        )
+        await session.commit()
+    return list(menu_ids)
+
+
+async def cleanup(menu_ids: list) -> None:
+    """Удаление тестового каталога"""
+    async with async_session_maker() as session:
+        submenu_ids = select(SubMenu.id).where(SubMenu.menu_id.in_(menu_ids))
+        await session.execute(delete(Dish).where(Dish.submenu_id.in_(submenu_ids)))
+        await session.execute(delete(SubMenu).where(SubMenu.menu_id.in_(menu_ids)))
+        await session.execute(delete(Menu).where(Menu.id.in_(menu_ids)))
+        await session.commit()
+
+
+async def menus_tree(repo: MenuServiceRepo) -> AsyncIterator[bytes]:
+    """Тело ответа /menus-tree/ без кэша"""
+    yield MENUS_TREE_SCHEMA.dump_json(await repo.crud_repo.get_menus_tree())
+
+
+async def catalog_export(repo: MenuServiceRepo) -> AsyncIterator[bytes]:
+    """Тело ответа выгрузки каталога"""
+    async for chunk in repo.export_catalog():
+        yield chunk
+
+
+async def consume(export: Export) -> tuple[float, float]:
+    """Время до первого байта и до конца ответа (ms)"""
+    async with async_session_maker() as session:
+        repo = MenuServiceRepo(
+            MenuCRUDRepo(session), CacheRepo(BackgroundTasks(), get_redis())
+        )
+        start = time.perf_counter()
+        first_byte = None
+        async for _ in export(repo):
+            if first_byte is None:
+                first_byte = (time.perf_counter() - start) * 1000
+        total = (time.perf_counter() - start) * 1000
+        return first_byte if first_byte is not None else total, total
+
+
+async def peak_memory(export: Export) -> float:
+    """Пик выделенной памяти (MiB) за один ответ"""
+    tracemalloc.start()
+    try:
+        await consume(export)
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+async def main() -> None:
+    print(
+        f'{"dishes":>7} | {"endpoint":>14} | {"first byte, ms":>14} | '
+        f'{"total, ms":>9} | {"peak, MiB":>9}'
+    )
+    for dishes_per_submenu in CATALOG_SIZES:
+        menu_ids = await seed(dishes_per_submenu)
+        dishes = MENUS * SUBMENUS_PER_MENU * dishes_per_submenu
+        try:
+            for export in (menus_tree, catalog_export):
+                first_byte, total = await consume(export)
+                peak = await peak_memory(export)
+                print(
+                    f'{dishes:>7} | {export.__name__:>14} | {first_byte:>14.1f} | '
+                    f'{total:>9.1f} | {peak:>9.1f}'
+                )
+        finally:
+            await cleanup(menu_ids)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,150 @@
+"""Бенчмарк эндпойнта get_all_menus: подзапросы count против столбцов-счетчиков.
+
+Каждый запрос идет мимо кэша, чтобы измерять запрос к бд.
+Запуск (нужны доступные postgres и redis из .env):
+    python -m benchmarks.menus_counters
+"""
+
+import asyncio
+import statistics
+import time
+from unittest.mock import patch
+
+from fastapi import BackgroundTasks
+from httpx import AsyncClient
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.api.menu.crud_repo import MenuCRUDRepo
+from src.caching.cache_repo import CacheRepo
+from src.database import async_session_maker, get_redis
+from src.main import app
+from src.model_definitions.models import Dish, Menu, SubMenu
+from src.schemas.pagination_schemas import Page
+from src.utils import paginate
+
+MENUS = 10_000
+SUBMENUS_PER_MENU = 2
+DISHES_PER_SUBMENU = 3
+REQUESTS = 3
+
+SUBMENUS_COUNT = (
+    select(func.count(SubMenu.id))
+    .where(SubMenu.menu_id == Menu.id)
+    .correlate(Menu)
+    .scalar_subquery()
+)
+DISHES_COUNT = (
+    select(func.count(Dish.id))
+    .join(SubMenu, Dish.submenu_id == SubMenu.id)
+    .where(SubMenu.menu_id == Menu.id)
+    .correlate(Menu)
+    .scalar_subquery()
+)
+
+
+async def get_all_menus_with_subqueries(
+    self: MenuCRUDRepo, page: Page = Page()
+) -> list[Menu]:
+    """Получение всех меню со счетчиками из коррелированных подзапросов"""
+    query = paginate(select(Menu, SUBMENUS_COUNT, DISHES_COUNT), Menu, page)
+    result = await self.session.execute(query)
+    menus = []
+    for menu, submenus_count, dishes_count in result:
+        set_committed_value(menu, 'submenus_count', submenus_count)
+        set_committed_value(menu, 'dishes_count', dishes_count)
+        menus.append(menu)
+    return menus
+
+
+async def seed() -> list:
+    """Заполнение бд тестовыми меню"""
+    async with async_session_maker() as session:
+        menu_ids = (
+            await session.scalars(
+                insert(Menu).returning(Menu.id),
+                [
+                    {'title': f'bench menu {m}', 'description': 'bench'}
+                    for m in range(MENUS)
+                ],
+            )
+        ).all()
+        submenu_ids = (
+            await session.scalars(
+                insert(SubMenu).returning(SubMenu.id),
+                [
+                    {
+                        'title': f'bench submenu {s}',
+                        'description': 'bench',
+                        'menu_id': menu_id,
+                    }
+                    for menu_id in menu_ids
+                    for s in range(SUBMENUS_PER_MENU)
+                ],
+            )
+        ).all()
+        await session.execute(
+            insert(Dish),
+            [
+                {
+                    'title': f'bench dish {d}',
+                    'description': 'bench',
+                    'price': 9.99,
+                    'submenu_id': submenu_id,
+                }
+                for submenu_id in submenu_ids
+                for d in range(DISHES_PER_SUBMENU)
+            ],
+        )
+        await session.commit()
+    return list(menu_ids)
+
+
+async def cleanup(menu_ids: list) -> None:
+    """Удаление тестовых меню"""
+    async with async_session_maker() as session:
+        submenu_ids = select(SubMenu.id).where(SubMenu.menu_id.in_(menu_ids))
+        await session.execute(delete(Dish).where(Dish.submenu_id.in_(submenu_ids)))
+        await session.execute(delete(SubMenu).where(SubMenu.menu_id.in_(menu_ids)))
+        await session.execute(delete(Menu).where(Menu.id.in_(menu_ids)))
+        await session.commit()
+
+
+async def clear_menus_cache() -> None:
+    """Удаление кэша эндпойнта get_all_menus"""
+    repo = CacheRepo(BackgroundTasks(), get_redis())
+    repo.invalidate_all_menu_cache()
+    await repo.flush_invalidations()
+
+
+async def measure(ac: AsyncClient) -> tuple[float, float]:
+    """Медиана и максимум (ms) запросов к /menus/ без кэша"""
+    latencies: list[float] = []
+    for _ in range(REQUESTS):
+        await clear_menus_cache()
+        start = time.perf_counter()
+        response = await ac.get('/api/v1/menus/')
+        latencies.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    return statistics.median(latencies), max(latencies)
+
+
+async def main() -> None:
+    menu_ids = await seed()
+    try:
+        async with AsyncClient(app=app, base_url='http://bench') as ac:
+            print(f'{"counts":>10} | {"p50, ms":>9} | {"max, ms":>9}')
+            for name, loader in (
+                ('subquery', get_all_menus_with_subqueries),
+                ('columns', MenuCRUDRepo.get_all_menus),
+            ):
+                with patch.object(MenuCRUDRepo, 'get_all_menus', loader):
+                    p50, slowest = await measure(ac)
+                print(f'{name:>10} | {p50:>9.1f} | {slowest:>9.1f}')
+    finally:
+        await cleanup(menu_ids)
+        await clear_menus_cache()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+"""Бенчмарк кэша эндпойнта get_menus_tree: pickle ORM объектов против JSON байтов.
+
+Запуск (нужны доступные postgres и redis из .env):
+    python -m benchmarks.menus_tree_cache_modes
+"""
+
+import asyncio
+import statistics
+import time
+
+from fastapi import BackgroundTasks
+from httpx import AsyncClient
+from sqlalchemy import delete, select
+
+from src.caching.cache_repo import JSON_MODE, OBJECTS_MODE, CacheRepo
+from src.database import async_session_maker, get_redis
+from src.main import app
+from src.model_definitions.models import Dish, Menu, SubMenu
+
+MENUS = 10
+SUBMENUS_PER_MENU = 10
+DISHES_PER_SUBMENU = 20
+REQUESTS = 2000
+CONCURRENCY = 20
+
+
+async def seed() -> list:
+    """Заполнение бд тестовым деревом меню"""
+    menus = []
+    async with async_session_maker() as session:
+        for m in range(MENUS):
+            menu = Menu(title=f'bench menu {m}', description='bench')
+            for s in range(SUBMENUS_PER_MENU):
+                submenu = SubMenu(title=f'bench submenu {s}', description='bench')
+                submenu.dishes = [
+                    Dish(title=f'bench dish {d}', description='bench', price=9.99)
+                    for d in range(DISHES_PER_SUBMENU)
+                ]
+                menu.submenus.append(submenu)
+            menus.append(menu)
+        session.add_all(menus)
+        await session.commit()
+    return [menu.id for menu in menus]
+
+
+async def cleanup(menu_ids: list) -> None:
+    """Удаление тестового дерева меню"""
+    async with async_session_maker() as session:
+        submenu_ids = select(SubMenu.id).where(SubMenu.menu_id.in_(menu_ids))
+        await session.execute(delete(Dish).where(Dish.submenu_id.in_(submenu_ids)))
+        await session.execute(delete(SubMenu).where(SubMenu.menu_id.in_(menu_ids)))
+        await session.execute(delete(Menu).where(Menu.id.in_(menu_ids)))
+        await session.commit()
+
+
+async def clear_menus_tree_cache() -> None:
+    """Удаление кэша эндпойнта get_menus_tree"""
+    repo = CacheRepo(BackgroundTasks(), get_redis())
+    repo.invalidate_menus_tree_cache()
+    await repo.flush_invalidations()
+
+
+async def measure(ac: AsyncClient, mode: str) -> tuple[float, float]:
+    """Пропускная способность (req/s) и p99 (ms) для горячего кэша"""
+    CacheRepo.mode = mode
+    await clear_menus_tree_cache()
+    await ac.get('/api/v1/menus-tree/')
+
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def request() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            response = await ac.get('/api/v1/menus-tree/')
+            latencies.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(REQUESTS)))
+    elapsed = time.perf_counter() - start
+    return REQUESTS / elapsed, statistics.quantiles(latencies, n=100)[98]
+
+
+async def main() -> None:
+    menu_ids = await seed()
+    try:
+        async with AsyncClient(app=app, base_url='http://bench') as ac:
+            print(f'{"mode":>8} | {"req/s":>8} | {"p99, ms":>8}')
+            for mode in (OBJECTS_MODE, JSON_MODE):
+                rps, p99 = await measure(ac, mode)
+                print(f'{mode:>8} | {rps:>8.0f} | {p99:>8.2f}')
+    finally:
+        await cleanup(menu_ids)
+        await clear_menus_tree_cache()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+"""Бенчмарк загрузки дерева меню: ORM объекты против JSON, собранного postgres.
+
+Каждый запрос идет мимо кэша, чтобы измерять загрузку дерева из бд.
+Запуск (нужны доступные postgres и redis из .env):
+    python -m benchmarks.menus_tree_engines
+"""
+
+import asyncio
+import statistics
+import time
+
+from fastapi import BackgroundTasks
+from httpx import AsyncClient
+from sqlalchemy import delete, insert, select
+
+from src.api.menu.service_repo import ORM_ENGINE, SQL_ENGINE, MenuServiceRepo
+from src.caching.cache_repo import JSON_MODE, CacheRepo
+from src.database import async_session_maker, get_redis
+from src.main import app
+from src.model_definitions.models import Dish, Menu, SubMenu
+
+MENUS = 50
+SUBMENUS_PER_MENU = 20
+DISHES_PER_SUBMENU = 100
+REQUESTS = 20
+
+
+async def seed() -> list:
+    """Заполнение бд деревом меню со 100 тысячами блюд"""
+    async with async_session_maker() as session:
+        menu_ids = (
+            await session.scalars(
+                insert(Menu).returning(Menu.id),
+                [
+                    {'title': f'bench menu {m}', 'description': 'bench'}
+                    for m in range(MENUS)
+                ],
+            )
+        ).all()
+        submenu_ids = (
+            await session.scalars(
+                insert(SubMenu).returning(SubMenu.id),
+                [
+                    {
+                        'title': f'bench submenu {s}',
+                        'description': 'bench',
+                        'menu_id': menu_id,
+                    }
+                    for menu_id in menu_ids
+                    for s in range(SUBMENUS_PER_MENU)
+                ],
+            )
+        ).all()
+        await session.execute(
+            insert(Dish),
+            [
+                {
+                    'title': f'bench dish {d}',
+                    'description': 'bench',
+                    'price': 9.99,
+                    'submenu_id': submenu_id,
+                }
+                for submenu_id in submenu_ids
+                for d in range(DISHES_PER_SUBMENU)
+            ],
+        )
+        await session.commit()
+    return list(menu_ids)
+
+
+async def cleanup(menu_ids: list) -> None:
+    """Удаление тестового дерева меню"""
+    async with async_session_maker() as session:
+        submenu_ids = select(SubMenu.id).where(SubMenu.menu_id.in_(menu_ids))
+        await session.execute(delete(Dish).where(Dish.submenu_id.in_(submenu_ids)))
+        await session.execute(delete(SubMenu).where(SubMenu.menu_id.in_(menu_ids)))
+        await session.execute(delete(Menu).where(Menu.id.in_(menu_ids)))
+        await session.commit()
+
+
+async def clear_menus_tree_cache() -> None:
+    """Удаление кэша эндпойнта get_menus_tree"""
+    repo = CacheRepo(BackgroundTasks(), get_redis())
+    repo.invalidate_menus_tree_cache()
+    await repo.flush_invalidations()
+
+
+async def measure(ac: AsyncClient, engine: str) -> tuple[float, float]:
+    """Медиана и p95 (ms) запросов к /menus-tree/ без кэша"""
+    MenuServiceRepo.tree_engine = engine
+    latencies: list[float] = []
+    for _ in range(REQUESTS):
+        await clear_menus_tree_cache()
+        start = time.perf_counter()
+        response = await ac.get('/api/v1/menus-tree/')
+        latencies.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    return statistics.median(latencies), statistics.quantiles(latencies, n=20)[18]
+
+
+async def main() -> None:
+    menu_ids = await seed()
+    CacheRepo.mode = JSON_MODE
+    try:
+        async with AsyncClient(app=app, base_url='http://bench') as ac:
+            print(f'{"engine":>8} | {"p50, ms":>8} | {"p95, ms":>8}')
+            for engine in (ORM_ENGINE, SQL_ENGINE):
+                p50, p95 = await measure(ac, engine)
+                print(f'{engine:>8} | {p50:>8.1f} | {p95:>8.1f}')
+    finally:
+        await cleanup(menu_ids)
+        await clear_menus_tree_cache()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
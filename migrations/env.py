@@ -1,7 +1,7 @@
 from logging.config import fileConfig
 
 from alembic import context
-from sqlalchemy import engine_from_config, pool
+from sqlalchemy import Connection, engine_from_config, inspect, pool, text
 
 from src.config import DB_HOST, DB_NAME, DB_PASS, DB_PORT, DB_USER
 from src.model_definitions.models import metadata
@@ -58,6 +58,17 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
+def fix_first_revision(connection: Connection) -> None:
+    """Первая миграция имела id 'head', который alembic принимает за последнюю"""
+    if inspect(connection).has_table('alembic_version'):
+        connection.execute(
+            text(
+                "UPDATE alembic_version SET version_num = '3bd04ebdc49b' "
+                "WHERE version_num = 'head'"
+            )
+        )
+
+
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode.
 
@@ -75,6 +86,7 @@ def run_migrations_online() -> None:
         context.configure(connection=connection, target_metadata=target_metadata)
 
         with context.begin_transaction():
+            fix_first_revision(connection)
             context.run_migrations()
 
 
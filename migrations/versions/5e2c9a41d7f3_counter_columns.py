@@ -0,0 +1,59 @@
+"""Counter columns
+
+Revision ID: 5e2c9a41d7f3
+Revises: 3bd04ebdc49b
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+from src.model_definitions.counters import (
+    BACKFILL_COUNTERS,
+    COUNT_DISHES_FUNCTION,
+    COUNT_DISHES_TRIGGER,
+    COUNT_SUBMENUS_FUNCTION,
+    COUNT_SUBMENUS_TRIGGER,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2c9a41d7f3'
+down_revision: str | None = '3bd04ebdc49b'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'menus',
+        sa.Column('submenus_count', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.add_column(
+        'menus',
+        sa.Column('dishes_count', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.add_column(
+        'submenus',
+        sa.Column('dishes_count', sa.Integer(), server_default='0', nullable=False),
+    )
+    for statement in (
+        COUNT_SUBMENUS_FUNCTION,
+        COUNT_SUBMENUS_TRIGGER,
+        COUNT_DISHES_FUNCTION,
+        COUNT_DISHES_TRIGGER,
+        *BACKFILL_COUNTERS,
+    ):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER count_dishes ON dishes')
+    op.execute('DROP TRIGGER count_submenus ON submenus')
+    op.execute('DROP FUNCTION count_dishes()')
+    op.execute('DROP FUNCTION count_submenus()')
+    op.drop_column('submenus', 'dishes_count')
+    op.drop_column('menus', 'dishes_count')
+    op.drop_column('menus', 'submenus_count')
@@ -1,13 +1,14 @@
 from uuid import UUID
 
 from fastapi import Depends
-from sqlalchemy import and_, select
+from sqlalchemy import and_, case, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_async_session
 from src.model_definitions.models import Dish, SubMenu
 from src.schemas.dish_schemas import DishInput, DishUpdate
-from src.utils import check_if_exists
+from src.schemas.pagination_schemas import DishPage
+from src.utils import check_if_exists, paginate
 
 
 class DishCRUDRepo:
@@ -16,12 +17,32 @@ class DishCRUDRepo:
     def __init__(self, session: AsyncSession = Depends(get_async_session)) -> None:
         self.session = session
 
-    async def get_all_dishes(self, submenu_id: UUID) -> list[Dish]:
-        """Получение всех блюд"""
+    async def get_all_dishes(
+        self,
+        submenu_id: UUID,
+        page: DishPage = DishPage(),
+        discounts: dict[UUID, int] | None = None,
+    ) -> list[Dish]:
+        """Получение всех блюд или их страницы с фильтром по цене со скидкой"""
         query = select(Dish).where(Dish.submenu_id == submenu_id)
+        price = Dish.price
+        if discounts:
+            price = Dish.price * (100 - case(discounts, value=Dish.id, else_=0)) / 100
+        if page.price_min is not None:
+            query = query.where(price >= page.price_min)
+        if page.price_max is not None:
+            query = query.where(price <= page.price_max)
+        query = paginate(query, Dish, page)
         result = await self.session.execute(query)
         return result.scalars().fetchall()
 
+    async def get_all_dish_ids(self, submenu_id: UUID) -> list[UUID]:
+        """Получение id всех блюд без загрузки самих блюд"""
+        result = await self.session.scalars(
+            select(Dish.id).where(Dish.submenu_id == submenu_id)
+        )
+        return result.all()
+
     async def create_dish(self, submenu_id: UUID, data: DishInput) -> Dish:
         """Добавление нового блюда"""
         dish = Dish(submenu_id=submenu_id, **data.model_dump())
@@ -5,6 +5,8 @@ from fastapi import APIRouter, BackgroundTasks, Depends, status
 from src.api.dish.service_repo import DishServiceRepo
 from src.config import DISH_URL, DISHES_URL
 from src.schemas.dish_schemas import DishInput, DishOutput, DishUpdate
+from src.schemas.pagination_schemas import DishPage
+from src.utils import get_dish_page
 
 dish_router = APIRouter(prefix='/api/v1')
 
@@ -14,10 +16,13 @@ async def get_all_dishes(
     bg_tasks: BackgroundTasks,
     target_menu_id: UUID,
     target_submenu_id: UUID,
+    page: DishPage = Depends(get_dish_page),
     repo: DishServiceRepo = Depends(),
 ) -> list[DishOutput]:
-    """Получение всех блюд"""
-    return await repo.get_all_dishes(bg_tasks, target_menu_id, target_submenu_id)
+    """Получение всех блюд или их страницы"""
+    return await repo.get_all_dishes(
+        bg_tasks, target_menu_id, target_submenu_id, page
+    )
 
 
 @dish_router.get(DISH_URL, response_model=DishOutput, name='get_dish')
@@ -1,12 +1,12 @@
 from uuid import UUID
 
-from fastapi import BackgroundTasks, Depends
+from fastapi import BackgroundTasks, Depends, Response
 
 from src.api.dish.crud_repo import DishCRUDRepo
-from src.caching.cache_repo import CacheRepo
+from src.caching.cache_repo import CacheRepo, get_cache_repo, service_loader
 from src.model_definitions.models import Dish
 from src.schemas.dish_schemas import DishInput
-from src.utils import update_dish_price
+from src.schemas.pagination_schemas import DishPage
 
 
 class DishServiceRepo:
@@ -15,42 +15,63 @@ class DishServiceRepo:
     def __init__(
         self,
         crud_repo: DishCRUDRepo = Depends(),
-        cache_repo: CacheRepo = Depends(),
+        cache_repo: CacheRepo = Depends(get_cache_repo),
     ) -> None:
         self.crud_repo = crud_repo
         self.cache_repo = cache_repo
 
     async def get_all_dishes(
-        self, bg_tasks: BackgroundTasks, menu_id: UUID, submenu_id: UUID
-    ) -> list[Dish]:
-        """Получение всех блюд"""
-        cache = await self.cache_repo.get_all_dishes_cache(menu_id, submenu_id)
-        if cache:
-            return cache
-        dishes = await self.crud_repo.get_all_dishes(submenu_id)
-
-        for dish in dishes:
-            discount = await self.cache_repo.get_discount_cache(dish.id)
-            update_dish_price(dish, discount)
-
-        bg_tasks.add_task(
-            self.cache_repo.set_all_dishes_cache, menu_id, submenu_id, dishes
+        self,
+        bg_tasks: BackgroundTasks,
+        menu_id: UUID,
+        submenu_id: UUID,
+        page: DishPage = DishPage(),
+    ) -> list[Dish] | Response:
+        """Получение всех блюд или их страницы"""
+        return await self.cache_repo.get_all_dishes_cache(
+            menu_id,
+            submenu_id,
+            service_loader(
+                self, DishServiceRepo.load_all_dishes, menu_id, submenu_id, page
+            ),
+            page,
         )
 
+    async def load_all_dishes(
+        self, menu_id: UUID, submenu_id: UUID, page: DishPage = DishPage()
+    ) -> list[Dish]:
+        """Загрузка всех блюд из бд и добавление их в кэш.
+
+        Фильтр по цене сравнивает цены со скидками, поэтому для него скидки
+        блюд подменю читаются до запроса.
+        """
+        discounts: dict[UUID, int] = {}
+        if page.by_price:
+            discounts = await self.cache_repo.get_discounts_cache(
+                await self.crud_repo.get_all_dish_ids(submenu_id)
+            )
+        dishes = await self.crud_repo.get_all_dishes(submenu_id, page, discounts)
+        await self.cache_repo.set_all_dishes_cache(menu_id, submenu_id, dishes, page)
+
         return dishes
 
     async def get_specific_dish(
         self, bg_tasks: BackgroundTasks, menu_id: UUID, submenu_id: UUID, dish_id: UUID
-    ) -> Dish:
+    ) -> Dish | Response:
         """Получение определенного блюда"""
-        cache = await self.cache_repo.get_dish_cache(menu_id, submenu_id, dish_id)
-        if cache:
-            return cache
-        dish = await self.crud_repo.get_specific_dish(menu_id, submenu_id, dish_id)
-        discount = await self.cache_repo.get_discount_cache(dish.id)
-        update_dish_price(dish, discount)
+        return await self.cache_repo.get_dish_cache(
+            menu_id,
+            submenu_id,
+            dish_id,
+            service_loader(
+                self, DishServiceRepo.load_dish, menu_id, submenu_id, dish_id
+            ),
+        )
 
-        bg_tasks.add_task(self.cache_repo.set_dish_cache, menu_id, submenu_id, dish)
+    async def load_dish(self, menu_id: UUID, submenu_id: UUID, dish_id: UUID) -> Dish:
+        """Загрузка блюда из бд и добавление его в кэш"""
+        dish = await self.crud_repo.get_specific_dish(menu_id, submenu_id, dish_id)
+        await self.cache_repo.set_dish_cache(menu_id, submenu_id, dish)
 
         return dish
 
@@ -63,8 +84,9 @@ class DishServiceRepo:
     ) -> Dish:
         """Добавление нового блюда"""
         dish = await self.crud_repo.create_dish(submenu_id, data)
-        bg_tasks.add_task(self.cache_repo.delete_all_dishes_cache, menu_id, submenu_id)
-        bg_tasks.add_task(self.cache_repo.delete_menus_tree_cache)
+        self.cache_repo.invalidate_all_dishes_cache(menu_id, submenu_id)
+        self.cache_repo.invalidate_menus_tree_cache()
+        bg_tasks.add_task(self.cache_repo.flush_invalidations)
 
         return dish
 
@@ -78,10 +100,9 @@ class DishServiceRepo:
     ) -> Dish:
         """Изменение блюда"""
         dish = await self.crud_repo.update_dish(menu_id, submenu_id, dish_id, data)
-        bg_tasks.add_task(
-            self.cache_repo.delete_dish_cache, menu_id, submenu_id, dish_id
-        )
-        bg_tasks.add_task(self.cache_repo.delete_menus_tree_cache)
+        self.cache_repo.invalidate_dish_cache(menu_id, submenu_id, dish_id)
+        self.cache_repo.invalidate_menus_tree_cache()
+        bg_tasks.add_task(self.cache_repo.flush_invalidations)
 
         return dish
 
@@ -90,8 +111,7 @@ class DishServiceRepo:
     ) -> None:
         """Удаление блюда"""
         await self.crud_repo.delete_dish(menu_id, submenu_id, dish_id)
-        bg_tasks.add_task(self.cache_repo.delete_all_dishes_cache, menu_id, submenu_id)
-        bg_tasks.add_task(
-            self.cache_repo.delete_dish_cache, menu_id, submenu_id, dish_id
-        )
-        bg_tasks.add_task(self.cache_repo.delete_menus_tree_cache)
+        self.cache_repo.invalidate_all_dishes_cache(menu_id, submenu_id)
+        self.cache_repo.invalidate_dish_cache(menu_id, submenu_id, dish_id)
+        self.cache_repo.invalidate_menus_tree_cache()
+        bg_tasks.add_task(self.cache_repo.flush_invalidations)
@@ -1,14 +1,106 @@
+from collections.abc import AsyncIterator
 from uuid import UUID
 
 from fastapi import Depends
-from sqlalchemy import select
+from sqlalchemy import (
+    ColumnElement,
+    Float,
+    Select,
+    String,
+    Text,
+    case,
+    func,
+    literal_column,
+    select,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from src.database import get_async_session
-from src.model_definitions.models import Menu, SubMenu
+from src.database import async_session_maker, get_async_session
+from src.model_definitions.models import Dish, Menu, SubMenu
 from src.schemas.menu_schemas import MenuInput, MenuUpdate
-from src.utils import check_if_exists
+from src.schemas.pagination_schemas import Page
+from src.utils import check_if_exists, paginate
+
+EMPTY_JSON_ARRAY = literal_column("'[]'::json")
+
+
+def price_text(price: ColumnElement) -> ColumnElement:
+    """Цена строкой, как ее сериализует DishOutput: str(float(price))"""
+    return case(
+        (price == func.trunc(price), func.trunc(price).cast(String) + '.0'),
+        else_=price.cast(Float).cast(String),
+    )
+
+
+def menus_tree_json_query() -> Select:
+    """Запрос, собирающий дерево меню в JSON ответа get_menus_tree.
+
+    Блюда и подменю агрегируются группировкой, а не подзапросом на каждую
+    строку. Ключи идут в порядке полей схем ответа.
+    """
+    dishes = (
+        select(
+            Dish.submenu_id,
+            func.json_agg(
+                func.json_build_object(
+                    'id', Dish.id,
+                    'title', Dish.title,
+                    'description', Dish.description,
+                    'price', price_text(Dish.price),
+                    'submenu_id', Dish.submenu_id,
+                )
+            ).label('dishes'),
+        )
+        .group_by(Dish.submenu_id)
+        .cte('tree_dishes')
+    )
+    submenus = (
+        select(
+            SubMenu.menu_id,
+            func.json_agg(
+                func.json_build_object(
+                    'id', SubMenu.id,
+                    'title', SubMenu.title,
+                    'description', SubMenu.description,
+                    'dishes_count', SubMenu.dishes_count,
+                    'menu_id', SubMenu.menu_id,
+                    'dishes', func.coalesce(dishes.c.dishes, EMPTY_JSON_ARRAY),
+                )
+            ).label('submenus'),
+        )
+        .outerjoin(dishes, dishes.c.submenu_id == SubMenu.id)
+        .group_by(SubMenu.menu_id)
+        .cte('tree_submenus')
+    )
+    menus = func.json_agg(
+        func.json_build_object(
+            'id', Menu.id,
+            'title', Menu.title,
+            'description', Menu.description,
+            'submenus_count', Menu.submenus_count,
+            'dishes_count', Menu.dishes_count,
+            'submenus', func.coalesce(submenus.c.submenus, EMPTY_JSON_ARRAY),
+        )
+    )
+    return select(func.coalesce(menus, EMPTY_JSON_ARRAY).cast(Text)).outerjoin_from(
+        Menu, submenus, submenus.c.menu_id == Menu.id
+    )
+
+
+CATALOG_QUERIES = {
+    'menu': select(
+        Menu.id, Menu.title, Menu.description, Menu.submenus_count, Menu.dishes_count
+    ),
+    'submenu': select(
+        SubMenu.id,
+        SubMenu.title,
+        SubMenu.description,
+        SubMenu.dishes_count,
+        SubMenu.menu_id,
+    ),
+    'dish': select(Dish.id, Dish.title, Dish.description, Dish.price, Dish.submenu_id),
+}
 
 
 class MenuCRUDRepo:
@@ -25,12 +117,44 @@ class MenuCRUDRepo:
         result = await self.session.execute(query)
         return result.scalars().fetchall()
 
-    async def get_all_menus(self) -> list[Menu]:
-        """Получение всех меню"""
-        query = select(Menu)
+    async def get_menus_tree_json(self) -> bytes:
+        """Получение дерева меню в виде JSON, собранного бд одним запросом"""
+        menus_tree = await self.session.scalar(menus_tree_json_query())
+        return menus_tree.encode()
+
+    async def stream_catalog(
+        self, batch_size: int
+    ) -> AsyncIterator[tuple[str, list[dict]]]:
+        """Пачки строк всех меню, затем подменю и блюд из серверных курсоров бд.
+
+        Потоковый ответ читается после закрытия сессии запроса, поэтому выгрузка
+        открывает свою сессию. Все три запроса видят один снимок бд.
+        """
+        async with async_session_maker() as session:
+            await session.connection(
+                execution_options={
+                    'isolation_level': 'REPEATABLE READ',
+                    'postgresql_readonly': True,
+                }
+            )
+            for kind, query in CATALOG_QUERIES.items():
+                result = await session.stream(
+                    query.execution_options(yield_per=batch_size)
+                )
+                async for rows in result.mappings().partitions():
+                    yield kind, [dict(row) for row in rows]
+
+    async def get_all_menus(self, page: Page = Page()) -> list[Menu]:
+        """Получение всех меню или их страницы"""
+        query = paginate(select(Menu), Menu, page)
         result = await self.session.execute(query)
         return result.scalars().fetchall()
 
+    async def get_all_menu_ids(self) -> list[UUID]:
+        """Получение id всех меню без загрузки самих меню"""
+        result = await self.session.scalars(select(Menu.id))
+        return result.all()
+
     async def create_menu(self, data: MenuInput) -> Menu:
         """Добавление нового меню"""
         menu = Menu(**data.model_dump())
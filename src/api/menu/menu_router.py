@@ -1,11 +1,14 @@
 from uuid import UUID
 
 from fastapi import APIRouter, BackgroundTasks, Depends, status
+from fastapi.responses import StreamingResponse
 
-from src.api.menu.service_repo import MenuServiceRepo
-from src.config import MENU_URL, MENUS_TREE, MENUS_URL
+from src.api.menu.service_repo import NDJSON_MEDIA_TYPE, MenuServiceRepo
+from src.config import CATALOG_EXPORT, MENU_URL, MENUS_TREE, MENUS_URL
 from src.schemas.menu_schemas import MenuInput, MenuOutput, MenuUpdate
 from src.schemas.menus_tree_schemas import MenusTreeMenuOutput
+from src.schemas.pagination_schemas import Page
+from src.utils import get_page
 
 menu_router = APIRouter(prefix='/api/v1')
 
@@ -18,12 +21,22 @@ async def get_menus_tree(bg_tasks: BackgroundTasks, repo: MenuServiceRepo = Depe
     return await repo.get_menus_tree(bg_tasks)
 
 
+@menu_router.get(
+    CATALOG_EXPORT, response_class=StreamingResponse, name='export_catalog'
+)
+async def export_catalog(repo: MenuServiceRepo = Depends()) -> StreamingResponse:
+    """Потоковая выгрузка всех меню, подменю и блюд, по строке JSON на объект"""
+    return StreamingResponse(repo.export_catalog(), media_type=NDJSON_MEDIA_TYPE)
+
+
 @menu_router.get(MENUS_URL, response_model=list[MenuOutput], name='get_menus')
 async def get_all_menus(
-    bg_tasks: BackgroundTasks, repo: MenuServiceRepo = Depends()
+    bg_tasks: BackgroundTasks,
+    page: Page = Depends(get_page),
+    repo: MenuServiceRepo = Depends(),
 ) -> list[MenuOutput]:
-    """Получение всех меню"""
-    return await repo.get_all_menus(bg_tasks)
+    """Получение всех меню или их страницы"""
+    return await repo.get_all_menus(bg_tasks, page)
 
 
 @menu_router.get(MENU_URL, response_model=MenuOutput, name='get_menu')
@@ -1,65 +1,114 @@
+from collections.abc import AsyncIterator
 from uuid import UUID
 
-from fastapi import BackgroundTasks, Depends
+from fastapi import BackgroundTasks, Depends, Response
 
 from src.api.menu.crud_repo import MenuCRUDRepo
-from src.caching.cache_repo import CacheRepo
+from src.caching.cache_repo import CacheRepo, get_cache_repo, service_loader
+from src.config import CATALOG_EXPORT_BATCH_SIZE, MENUS_TREE_ENGINE
 from src.model_definitions.models import Menu
+from src.schemas.export_schemas import CATALOG_SCHEMAS
 from src.schemas.menu_schemas import MenuInput
-from src.utils import update_dish_price
+from src.schemas.pagination_schemas import Page
+from src.utils import apply_discounts
+
+ORM_ENGINE = 'orm'
+SQL_ENGINE = 'sql'
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
 
 
 class MenuServiceRepo:
     """Service репозиторий для меню"""
 
+    tree_engine = MENUS_TREE_ENGINE
+
     def __init__(
-        self, crud_repo: MenuCRUDRepo = Depends(), cache_repo: CacheRepo = Depends()
+        self,
+        crud_repo: MenuCRUDRepo = Depends(),
+        cache_repo: CacheRepo = Depends(get_cache_repo),
     ) -> None:
         self.crud_repo = crud_repo
         self.cache_repo = cache_repo
 
-    async def get_menus_tree(self, bg_tasks: BackgroundTasks) -> list[Menu]:
+    async def get_menus_tree(
+        self, bg_tasks: BackgroundTasks
+    ) -> list[Menu] | Response:
         """Получение всех меню с подменю и блюдами связанными с ними"""
-        cache = await self.cache_repo.get_menus_tree_cache()
-        if cache:
-            return cache
-        menus_tree = await self.crud_repo.get_menus_tree()
+        return await self.cache_repo.get_menus_tree_cache(
+            service_loader(self, MenuServiceRepo.load_menus_tree)
+        )
 
-        for menu in menus_tree:
-            for submenu in menu.submenus:
-                for dish in submenu.dishes:
-                    discount = await self.cache_repo.get_discount_cache(dish.id)
-                    update_dish_price(dish, discount)
+    async def load_menus_tree(self) -> list[Menu] | bytes:
+        """Загрузка дерева меню из бд и добавление его в кэш.
 
-        bg_tasks.add_task(self.cache_repo.set_menus_tree_cache, menus_tree)
+        Движок SQL_ENGINE получает из бд готовый JSON ответа без ORM объектов.
+        """
+        if self.tree_engine == SQL_ENGINE:
+            menus_tree_json = await self.crud_repo.get_menus_tree_json()
+            await self.cache_repo.set_menus_tree_cache(menus_tree_json)
+            return menus_tree_json
+
+        menus_tree = await self.crud_repo.get_menus_tree()
+        await self.cache_repo.set_menus_tree_cache(menus_tree)
 
         return menus_tree
 
-    async def get_all_menus(self, bg_tasks: BackgroundTasks) -> list[Menu]:
-        """Получение всех меню"""
-        cache = await self.cache_repo.get_all_menus_cache()
-        if cache:
-            return cache
-        menus = await self.crud_repo.get_all_menus()
-        bg_tasks.add_task(self.cache_repo.set_all_menus_cache, menus)
+    async def export_catalog(self) -> AsyncIterator[bytes]:
+        """Выгрузка всех меню, подменю и блюд в NDJSON пачками строк.
+
+        Скидки читаются одним запросом на пачку блюд, поэтому память не растет
+        с размером каталога.
+        """
+        discounted = await self.cache_repo.has_discounts()
+        async for kind, rows in self.crud_repo.stream_catalog(
+            CATALOG_EXPORT_BATCH_SIZE
+        ):
+            if kind == 'dish' and discounted:
+                discounts = await self.cache_repo.get_discounts_cache(
+                    [row['id'] for row in rows]
+                )
+                apply_discounts(rows, discounts)
+            schema = CATALOG_SCHEMAS[kind]
+            yield ''.join(
+                f'{schema.model_validate(row).model_dump_json()}\n' for row in rows
+            ).encode()
+
+    async def get_all_menus(
+        self, bg_tasks: BackgroundTasks, page: Page = Page()
+    ) -> list[Menu] | Response:
+        """Получение всех меню или их страницы"""
+        return await self.cache_repo.get_all_menus_cache(
+            service_loader(self, MenuServiceRepo.load_all_menus, page), page
+        )
+
+    async def load_all_menus(self, page: Page = Page()) -> list[Menu]:
+        """Загрузка всех меню из бд и добавление их в кэш"""
+        menus = await self.crud_repo.get_all_menus(page)
+        await self.cache_repo.set_all_menus_cache(menus, page)
 
         return menus
 
-    async def get_specific_menu(self, bg_tasks: BackgroundTasks, menu_id: UUID) -> Menu:
+    async def get_specific_menu(
+        self, bg_tasks: BackgroundTasks, menu_id: UUID
+    ) -> Menu | Response:
         """Получение определенного меню"""
-        cache = await self.cache_repo.get_menu_cache(menu_id)
-        if cache:
-            return cache
+        return await self.cache_repo.get_menu_cache(
+            menu_id, service_loader(self, MenuServiceRepo.load_menu, menu_id)
+        )
+
+    async def load_menu(self, menu_id: UUID) -> Menu:
+        """Загрузка меню из бд и добавление его в кэш"""
         menu = await self.crud_repo.get_specific_menu(menu_id)
-        bg_tasks.add_task(self.cache_repo.set_menu_cache, menu)
+        await self.cache_repo.set_menu_cache(menu)
 
         return menu
 
     async def create_menu(self, bg_tasks: BackgroundTasks, data: MenuInput) -> Menu:
         """Добавление нового меню"""
         menu = await self.crud_repo.create_menu(data)
-        bg_tasks.add_task(self.cache_repo.delete_all_menu_cache)
-        bg_tasks.add_task(self.cache_repo.delete_menus_tree_cache)
+        self.cache_repo.invalidate_menu_cache(menu.id)
+        self.cache_repo.invalidate_menus_tree_cache()
+        bg_tasks.add_task(self.cache_repo.flush_invalidations)
 
         return menu
 
@@ -68,14 +117,16 @@ class MenuServiceRepo:
     ) -> Menu:
         """Изменение меню"""
         menu = await self.crud_repo.update_menu(menu_id, data)
-        bg_tasks.add_task(self.cache_repo.delete_menu_cache, menu_id)
-        bg_tasks.add_task(self.cache_repo.delete_menus_tree_cache)
+        self.cache_repo.invalidate_menu_cache(menu_id)
+        self.cache_repo.invalidate_menus_tree_cache()
+        bg_tasks.add_task(self.cache_repo.flush_invalidations)
 
         return menu
 
     async def delete_menu(self, bg_tasks: BackgroundTasks, menu_id: UUID) -> None:
         """Удаление меню"""
         await self.crud_repo.delete_menu(menu_id)
-        bg_tasks.add_task(self.cache_repo.delete_menu_cache, menu_id)
-        bg_tasks.add_task(self.cache_repo.delete_menu_tree_cache, menu_id)
-        bg_tasks.add_task(self.cache_repo.delete_menus_tree_cache)
+        self.cache_repo.invalidate_menu_cache(menu_id)
+        self.cache_repo.invalidate_menu_tree_cache(menu_id)
+        self.cache_repo.invalidate_menus_tree_cache()
+        bg_tasks.add_task(self.cache_repo.flush_invalidations)
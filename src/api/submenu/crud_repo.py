@@ -6,8 +6,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_async_session
 from src.model_definitions.models import SubMenu
+from src.schemas.pagination_schemas import Page
 from src.schemas.submenu_schemas import SubMenuInput, SubMenuUpdate
-from src.utils import check_if_exists
+from src.utils import check_if_exists, paginate
 
 
 class SubMenuCRUDRepo:
@@ -16,12 +17,23 @@ class SubMenuCRUDRepo:
     def __init__(self, session: AsyncSession = Depends(get_async_session)) -> None:
         self.session = session
 
-    async def get_all_submenus(self, menu_id: UUID) -> list[SubMenu]:
-        """Получение всех подменю"""
-        query = select(SubMenu).where(SubMenu.menu_id == menu_id)
+    async def get_all_submenus(
+        self, menu_id: UUID, page: Page = Page()
+    ) -> list[SubMenu]:
+        """Получение всех подменю или их страницы"""
+        query = paginate(
+            select(SubMenu).where(SubMenu.menu_id == menu_id), SubMenu, page
+        )
         result = await self.session.execute(query)
         return result.scalars().fetchall()
 
+    async def get_all_submenu_ids(self, menu_id: UUID) -> list[UUID]:
+        """Получение id всех подменю без загрузки самих подменю"""
+        result = await self.session.scalars(
+            select(SubMenu.id).where(SubMenu.menu_id == menu_id)
+        )
+        return result.all()
+
     async def create_submenu(self, menu_id: UUID, data: SubMenuInput) -> SubMenu:
         """Добавление нового подменю"""
         submenu = SubMenu(menu_id=menu_id, **data.model_dump())
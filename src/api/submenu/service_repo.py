@@ -1,10 +1,11 @@
 from uuid import UUID
 
-from fastapi import BackgroundTasks, Depends
+from fastapi import BackgroundTasks, Depends, Response
 
 from src.api.submenu.crud_repo import SubMenuCRUDRepo
-from src.caching.cache_repo import CacheRepo
+from src.caching.cache_repo import CacheRepo, get_cache_repo, service_loader
 from src.model_definitions.models import SubMenu
+from src.schemas.pagination_schemas import Page
 from src.schemas.submenu_schemas import SubMenuInput
 
 
@@ -14,32 +15,46 @@ class SubMenuServiceRepo:
     def __init__(
         self,
         crud_repo: SubMenuCRUDRepo = Depends(),
-        cache_repo: CacheRepo = Depends(),
+        cache_repo: CacheRepo = Depends(get_cache_repo),
     ) -> None:
         self.crud_repo = crud_repo
         self.cache_repo = cache_repo
 
     async def get_all_submenus(
-        self, bg_tasks: BackgroundTasks, menu_id: UUID
+        self, bg_tasks: BackgroundTasks, menu_id: UUID, page: Page = Page()
+    ) -> list[SubMenu] | Response:
+        """Получение всех подменю или их страницы"""
+        return await self.cache_repo.get_all_submenus_cache(
+            menu_id,
+            service_loader(self, SubMenuServiceRepo.load_all_submenus, menu_id, page),
+            page,
+        )
+
+    async def load_all_submenus(
+        self, menu_id: UUID, page: Page = Page()
     ) -> list[SubMenu]:
-        """Получение всех подменю"""
-        cache = await self.cache_repo.get_all_submenus_cache(menu_id)
-        if cache:
-            return cache
-        submenus = await self.crud_repo.get_all_submenus(menu_id)
-        bg_tasks.add_task(self.cache_repo.set_all_submenus_cache, menu_id, submenus)
+        """Загрузка всех подменю из бд и добавление их в кэш"""
+        submenus = await self.crud_repo.get_all_submenus(menu_id, page)
+        await self.cache_repo.set_all_submenus_cache(menu_id, submenus, page)
 
         return submenus
 
     async def get_specific_submenu(
         self, bg_tasks: BackgroundTasks, menu_id: UUID, submenu_id: UUID
-    ) -> SubMenu:
+    ) -> SubMenu | Response:
         """Получение определенного подменю"""
-        cache = await self.cache_repo.get_submenu_cache(menu_id, submenu_id)
-        if cache:
-            return cache
+        return await self.cache_repo.get_submenu_cache(
+            menu_id,
+            submenu_id,
+            service_loader(
+                self, SubMenuServiceRepo.load_submenu, menu_id, submenu_id
+            ),
+        )
+
+    async def load_submenu(self, menu_id: UUID, submenu_id: UUID) -> SubMenu:
+        """Загрузка подменю из бд и добавление его в кэш"""
         submenu = await self.crud_repo.get_specific_submenu(menu_id, submenu_id)
-        bg_tasks.add_task(self.cache_repo.set_submenu_cache, menu_id, submenu)
+        await self.cache_repo.set_submenu_cache(menu_id, submenu)
 
         return submenu
 
@@ -48,8 +63,9 @@ class SubMenuServiceRepo:
     ) -> SubMenu:
         """Добавление нового подменю"""
         submenu = await self.crud_repo.create_submenu(menu_id, data)
-        bg_tasks.add_task(self.cache_repo.delete_all_submenu_cache, menu_id)
-        bg_tasks.add_task(self.cache_repo.delete_menus_tree_cache)
+        self.cache_repo.invalidate_all_submenu_cache(menu_id)
+        self.cache_repo.invalidate_menus_tree_cache()
+        bg_tasks.add_task(self.cache_repo.flush_invalidations)
 
         return submenu
 
@@ -62,8 +78,9 @@ class SubMenuServiceRepo:
     ) -> SubMenu:
         """Изменение подменю"""
         submenu = await self.crud_repo.update_submenu(menu_id, submenu_id, data)
-        bg_tasks.add_task(self.cache_repo.delete_submenu_cache, menu_id, submenu_id)
-        bg_tasks.add_task(self.cache_repo.delete_menus_tree_cache)
+        self.cache_repo.invalidate_submenu_cache(menu_id, submenu_id)
+        self.cache_repo.invalidate_menus_tree_cache()
+        bg_tasks.add_task(self.cache_repo.flush_invalidations)
 
         return submenu
 
@@ -72,10 +89,8 @@ class SubMenuServiceRepo:
     ) -> None:
         """Удаление подменю"""
         await self.crud_repo.delete_submenu(menu_id, submenu_id)
-
-        bg_tasks.add_task(self.cache_repo.delete_all_submenu_cache, menu_id)
-        bg_tasks.add_task(self.cache_repo.delete_submenu_cache, menu_id, submenu_id)
-        bg_tasks.add_task(
-            self.cache_repo.delete_submenu_tree_cache, menu_id, submenu_id
-        )
-        bg_tasks.add_task(self.cache_repo.delete_menus_tree_cache)
+        self.cache_repo.invalidate_all_submenu_cache(menu_id)
+        self.cache_repo.invalidate_submenu_cache(menu_id, submenu_id)
+        self.cache_repo.invalidate_submenu_tree_cache(menu_id, submenu_id)
+        self.cache_repo.invalidate_menus_tree_cache()
+        bg_tasks.add_task(self.cache_repo.flush_invalidations)
@@ -4,7 +4,9 @@ from fastapi import APIRouter, BackgroundTasks, Depends, status
 
 from src.api.submenu.service_repo import SubMenuServiceRepo
 from src.config import SUBMENU_URL, SUBMENUS_URL
+from src.schemas.pagination_schemas import Page
 from src.schemas.submenu_schemas import SubMenuInput, SubMenuOutput, SubMenuUpdate
+from src.utils import get_page
 
 submenu_router = APIRouter(prefix='/api/v1')
 
@@ -15,10 +17,11 @@ submenu_router = APIRouter(prefix='/api/v1')
 async def get_all_submenus(
     bg_tasks: BackgroundTasks,
     target_menu_id: UUID,
+    page: Page = Depends(get_page),
     repo: SubMenuServiceRepo = Depends(),
 ) -> list[SubMenuOutput]:
-    """Получение всех подменю"""
-    return await repo.get_all_submenus(bg_tasks, target_menu_id)
+    """Получение всех подменю или их страницы"""
+    return await repo.get_all_submenus(bg_tasks, target_menu_id, page)
 
 
 @submenu_router.get(SUBMENU_URL, response_model=SubMenuOutput, name='get_submenu')
@@ -1,173 +1,839 @@
-import pickle
-from uuid import UUID
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import struct
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from functools import partial
+from typing import Any
+from uuid import UUID, uuid4
 
-from aioredis import Redis
-from fastapi import Depends
+from fastapi import BackgroundTasks, Depends, HTTPException, Request, Response, status
+from prometheus_client import REGISTRY
+from pydantic import TypeAdapter
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import get_redis
+from src.caching.codecs import CODECS, JSONCodec
+from src.caching.compression import compress, decompress
+from src.caching.local_cache import local_cache, publish_invalidation
+from src.caching.metrics import (
+    CACHE_ENTRY_SIZE,
+    CACHE_HITS,
+    CACHE_INVALIDATIONS,
+    CACHE_MISSES,
+    CACHE_SETS,
+    StatsCollector,
+)
+from src.caching.policy import (
+    CACHE_POLICIES,
+    DISHES,
+    MENUS,
+    MENUS_TREE,
+    SUBMENUS,
+    CachePolicy,
+)
+from src.caching.single_flight import Loader, single_flight
+from src.config import CACHE_CODEC, CACHE_MODE, NEGATIVE_CACHE_TTL
+from src.database import async_session_maker, get_redis, get_redis_replica
 from src.model_definitions.models import Dish, Menu, SubMenu
+from src.schemas.dish_schemas import DishOutput
+from src.schemas.menu_schemas import MenuOutput
+from src.schemas.menus_tree_schemas import MenusTreeMenuOutput
+from src.schemas.pagination_schemas import DishPage, Page
+from src.schemas.submenu_schemas import SubMenuOutput
+from src.utils import NEXT_CURSOR_HEADER, apply_discounts, next_cursor
 
 MENU_KEY = 'menus/{}'
 SUBMENU_KEY = 'menus/{}/submenus/'
 DISH_KEY = 'menus/{}/submenus/{}/dishes/'
+GLOBAL_VERSION_KEY = 'versions/global'
+MENU_VERSION_KEY = 'versions/menus/{}'
+SUBMENU_VERSION_KEY = 'versions/submenus/{}'
+DISCOUNTS_KEY = 'discounts'
+DISCOUNTS_VERSION_KEY = 'discounts/version'
+LOCK_KEY = 'locks/{}'
+ENTRY_HEADER = struct.Struct('!ddB8s')
+NOT_FOUND = 0xFF
+LOCK_POLL_INTERVAL = 0.05
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+OBJECTS_MODE = 'objects'
+JSON_MODE = 'json'
+
+MENUS_TREE_SCHEMA = TypeAdapter(list[MenusTreeMenuOutput])
+MENUS_SCHEMA = TypeAdapter(list[MenuOutput])
+MENU_SCHEMA = TypeAdapter(MenuOutput)
+SUBMENUS_SCHEMA = TypeAdapter(list[SubMenuOutput])
+SUBMENU_SCHEMA = TypeAdapter(SubMenuOutput)
+DISHES_SCHEMA = TypeAdapter(list[DishOutput])
+DISH_SCHEMA = TypeAdapter(DishOutput)
+JSON_CODEC = JSONCodec()
+ENTITY_TAG_SIZE = 8
+
+LoaderFactory = Callable[..., Loader]
+
+logger = logging.getLogger(__name__)
+
+pending_versions: set[str] = set()
+
+
+@dataclass
+class NegativeCacheMetrics:
+    """Счетчики кэша отсутствующих объектов в рамках процесса"""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Доля запросов отсутствующих объектов, отвеченных из кэша"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+negative_cache_metrics = NegativeCacheMetrics()
+REGISTRY.register(StatsCollector('cache_negative', negative_cache_metrics))
+
+
+def entity_tag(digest: bytes) -> str:
+    """Строгий ETag из хэша закэшированного значения"""
+    return f'"{digest.hex()}"'
+
+
+def discounted_tag(etag: str, discounts_version: int) -> str:
+    """ETag значения со скидками, меняющийся вместе с версией скидок"""
+    return f'{etag[:-1]}.{discounts_version}"'
+
+
+def validators(etag: str, modified: float | None) -> dict[str, str]:
+    """Заголовки ETag и Last-Modified закэшированного значения"""
+    if modified is None:
+        return {'ETag': etag}
+    return {'ETag': etag, 'Last-Modified': formatdate(modified, usegmt=True)}
+
+
+def service_loader(
+    service: Any, load: Callable[..., Any], *args: Any
+) -> LoaderFactory:
+    """Фабрика загрузчика метода load сервиса на сессии запроса или на переданной.
+
+    Фоновое обновление выполняется после закрытия сессии запроса, поэтому
+    для него сервис собирается заново на своей сессии, как при прогреве кэша.
+    """
+
+    def bind(session: AsyncSession | None = None) -> Loader:
+        if session is None:
+            return partial(load, service, *args)
+        crud_repo = type(service.crud_repo)(session)
+        return partial(load, type(service)(crud_repo, service.cache_repo), *args)
+
+    return bind
+
+
+def dishes_version_keys(
+    menu_id: UUID, submenu_id: UUID, page: DishPage
+) -> tuple[str, ...]:
+    """Версии, от которых зависит страница блюд.
+
+    Состав страницы с фильтром по цене зависит еще и от скидок.
+    """
+    version_keys = (
+        MENU_VERSION_KEY.format(menu_id),
+        SUBMENU_VERSION_KEY.format(submenu_id),
+    )
+    if page.by_price:
+        return (*version_keys, DISCOUNTS_VERSION_KEY)
+    return version_keys
+
+
+def find_dishes(data: Any) -> Iterator[dict]:
+    """Блюда в сериализованном значении кэша"""
+    if isinstance(data, list):
+        for item in data:
+            yield from find_dishes(item)
+    elif isinstance(data, dict):
+        if 'price' in data:
+            yield data
+        for nested in ('submenus', 'dishes'):
+            yield from find_dishes(data.get(nested, []))
 
 
 class CacheRepo:
     """Cache репозиторий для объктов меню, подменю и блюда"""
 
-    def __init__(self, redis: Redis = Depends(get_redis)) -> None:
+    mode = CACHE_MODE
+    codec = CODECS[CACHE_CODEC]
+
+    def __init__(
+        self, bg_tasks: BackgroundTasks, redis: Redis = Depends(get_redis)
+    ) -> None:
+        self.bg_tasks = bg_tasks
         self.redis = redis
+        self.replica = redis
+        self.bumped_versions = 0
+        self.load_started: dict[str, float] = {}
+        self.request: Request | None = None
+        self.response: Response | None = None
+        self.versioned_keys: dict[str, str] = {}
+        self.invalidated_versions: set[str] = set()
+
+    async def get_discounts_cache(self, dish_ids: list[UUID]) -> dict[UUID, int]:
+        """Получение скидок нескольких блюд одним запросом"""
+        if not dish_ids:
+            return {}
+        try:
+            discounts = await self.redis.hmget(
+                DISCOUNTS_KEY, [str(dish_id) for dish_id in dish_ids]
+            )
+        except RedisError:
+            logger.warning('Redis is unavailable, dishes are served without discounts')
+            return {}
+        return {
+            dish_id: int(discount)
+            for dish_id, discount in zip(dish_ids, discounts)
+            if discount is not None
+        }
+
+    async def has_discounts(self) -> bool:
+        """Есть ли хоть одна скидка, без чтения самих скидок"""
+        try:
+            return bool(await self.redis.exists(DISCOUNTS_KEY))
+        except RedisError:
+            logger.warning('Redis is unavailable, dishes are served without discounts')
+            return False
+
+    async def get_all_discounts_cache(self) -> dict[str, int]:
+        """Получение скидок всех блюд"""
+        discounts = await self.redis.hgetall(DISCOUNTS_KEY)
+        return {
+            dish_id.decode(): int(discount) for dish_id, discount in discounts.items()
+        }
+
+    async def get_discounts_version(self) -> int:
+        """Получение текущей версии скидок"""
+        return int(await self.redis.get(DISCOUNTS_VERSION_KEY) or 0)
+
+    async def set_discounts_cache(self, discounts: dict[str, int]) -> int:
+        """Атомарная замена всех скидок, возвращает новую версию.
+
+        Нулевые скидки не хранятся, чтобы has_discounts был ложным без скидок.
+        """
+        discounts = {
+            dish_id: discount for dish_id, discount in discounts.items() if discount
+        }
+        local_cache.delete(DISCOUNTS_VERSION_KEY)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(DISCOUNTS_KEY)
+            if discounts:
+                pipe.hset(DISCOUNTS_KEY, mapping=discounts)
+            pipe.incr(DISCOUNTS_VERSION_KEY)
+            publish_invalidation(pipe, DISCOUNTS_VERSION_KEY)
+            *_, version, _ = await pipe.execute()
+        return version
+
+    def encode(self, value: Any, schema: TypeAdapter) -> bytes:
+        """Сериализация значения для хранения в redis.
+
+        Значение может быть уже готовым JSON ответа, собранным бд.
+        """
+        if isinstance(value, bytes):
+            if self.mode == JSON_MODE:
+                return value
+            value = schema.validate_json(value)
+        if self.mode == JSON_MODE:
+            return JSON_CODEC.encode(value, schema)
+        return self.codec.encode(value, schema)
+
+    def decode(self, data: bytes, schema: TypeAdapter) -> Any:
+        """Десериализация значения, полученного из redis"""
+        if self.mode == JSON_MODE:
+            return data
+        return self.codec.decode(data, schema)
+
+    def to_result(self, value: Any, headers: dict[str, str]) -> Any:
+        """Готовый ответ из JSON байтов или сами объекты с заголовками ответа"""
+        if isinstance(value, bytes):
+            return Response(
+                content=value, media_type='application/json', headers=headers
+            )
+        if self.response is not None:
+            self.response.headers.update(headers)
+        return value
+
+    def is_not_modified(self, etag: str, modified: float | None) -> bool:
+        """Совпадает ли закэшированное значение с версией у клиента"""
+        if self.request is None:
+            return False
+        if_none_match = self.request.headers.get('if-none-match')
+        if if_none_match is not None:
+            etags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+            return '*' in etags or etag in etags
+        if_modified_since = self.request.headers.get('if-modified-since')
+        if if_modified_since is not None and modified is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(modified) <= since
+        return False
+
+    async def get_cache(
+        self,
+        key: str,
+        family: str,
+        schema: TypeAdapter,
+        loader: LoaderFactory,
+        discounts_version: int | None = None,
+    ) -> Any:
+        """Получение кэша из памяти процесса, а при его отсутствии из redis.
+
+        Промах кэша загружает значение одним вычислением на все одновременные
+        запросы, а устаревшее значение отдается, пока оно обновляется в фоне.
+        Если версия значения совпадает с версией у клиента, отдается 304 без
+        десериализации значения. Если передана версия скидок, к значению без
+        скидок применяются текущие скидки блюд.
+        """
+        cached_value = None
+        entry = local_cache.get(key)
+        if entry is not None:
+            CACHE_HITS.labels(family, 'local').inc()
+            etag, modified, value = entry
+        else:
+            cached_value = await self.replica.get(key)
+            if cached_value is None:
+                CACHE_MISSES.labels(family).inc()
+                value = await single_flight.do(
+                    key, lambda: self.load_locked(key, family, schema, loader())
+                )
+                entry = local_cache.get(key)
+                etag, modified = entry[:2] if entry else (None, None)
+            else:
+                CACHE_HITS.labels(family, 'redis').inc()
+                policy = CACHE_POLICIES[family]
+                etag, modified = self.entry_validators(cached_value, policy)
+                expires_at, delta, _, _ = ENTRY_HEADER.unpack_from(cached_value)
+                if policy.needs_refresh(expires_at, delta):
+                    await self.refresh_in_background(key, loader, policy)
+                value = None
+
+        if etag is not None and discounts_version is not None:
+            etag, modified = discounted_tag(etag, discounts_version), None
+        if etag is not None and self.is_not_modified(etag, modified):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers=validators(etag, modified),
+            )
+        if cached_value is not None:
+            value = self.decode_entry(key, cached_value, family, schema)
+        if discounts_version is not None:
+            value = await self.apply_discounts(key, value, schema, discounts_version)
+        return self.to_result(value, validators(etag, modified) if etag else {})
 
-    async def get_discount_cache(self, dish_id: UUID) -> int | None:
-        discount = await self.redis.get(str(dish_id))
-        if discount is not None:
-            return pickle.loads(discount)
-        return None
+    def entry_validators(
+        self, cached_value: bytes, policy: CachePolicy
+    ) -> tuple[str, float]:
+        """ETag и время изменения записи из redis, 404 для записи об отсутствии"""
+        expires_at, _, flag, digest = ENTRY_HEADER.unpack_from(cached_value)
+        if flag == NOT_FOUND:
+            negative_cache_metrics.hits += 1
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=cached_value[ENTRY_HEADER.size:].decode(),
+            )
+        return entity_tag(digest), expires_at - policy.ttl
 
-    async def delete_cache_by_mask(self, pattern: str) -> None:
-        """Удаление кэша по маске"""
-        for key in await self.redis.keys(pattern + '*'):
-            await self.redis.delete(key)
+    def decode_entry(
+        self, key: str, cached_value: bytes, family: str, schema: TypeAdapter
+    ) -> Any:
+        """Десериализация записи из redis и сохранение ее в памяти процесса"""
+        etag, modified = self.entry_validators(cached_value, CACHE_POLICIES[family])
+        flag = ENTRY_HEADER.unpack_from(cached_value)[2]
+        value = self.decode(decompress(flag, cached_value[ENTRY_HEADER.size:]), schema)
+        local_cache.set(key, (etag, modified, value))
+        return value
 
-    async def get_menus_tree_cache(self) -> list[Menu] | None:
+    async def apply_discounts(
+        self, key: str, value: Any, schema: TypeAdapter, discounts_version: int
+    ) -> Any:
+        """Значение с текущими скидками блюд, вычисляемое раз на версию скидок.
+
+        Запоминается то же представление, что хранит запись кэша процесса, в
+        режиме JSON_MODE - байты ответа, а не загруженные из бд объекты.
+        """
+        discounted_key = f'{key}#{discounts_version}'
+        discounted = local_cache.get(discounted_key)
+        if discounted is not None:
+            return discounted
+        if self.mode == JSON_MODE and not isinstance(value, bytes):
+            value = self.encode(value, schema)
+        if not await self.has_discounts():
+            local_cache.set(discounted_key, value)
+            return value
+        if isinstance(value, bytes):
+            data = schema.dump_python(schema.validate_json(value))
+        else:
+            data = schema.dump_python(
+                schema.validate_python(value, from_attributes=True)
+            )
+        dishes = list(find_dishes(data))
+        discounts = await self.get_discounts_cache([dish['id'] for dish in dishes])
+        if discounts:
+            apply_discounts(dishes, discounts)
+            discounted = schema.validate_python(data)
+            if isinstance(value, bytes):
+                discounted = schema.dump_json(discounted)
+        else:
+            discounted = value
+        local_cache.set(discounted_key, discounted)
+        return discounted
+
+    async def load_locked(
+        self, key: str, family: str, schema: TypeAdapter, load: Loader
+    ) -> Any:
+        """Загрузка значения под блокировкой redis, общей для всех процессов"""
+        lock = LOCK_KEY.format(key)
+        token = uuid4().hex
+        lock_ttl = CACHE_POLICIES[family].lock_ttl
+        if await self.redis.set(lock, token, nx=True, ex=lock_ttl):
+            return await self.load_and_release(key, load, token)
+
+        deadline = time.monotonic() + lock_ttl
+        while True:
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+            locked = await self.redis.exists(lock)
+            entry = local_cache.get(key)
+            if entry is not None:
+                return entry[2]
+            cached_value = await self.redis.get(key)
+            if cached_value is not None:
+                return self.decode_entry(key, cached_value, family, schema)
+            if not locked or time.monotonic() > deadline:
+                return await load()
+
+    async def refresh_in_background(
+        self, key: str, loader: LoaderFactory, policy: CachePolicy
+    ) -> None:
+        """Запуск фонового обновления значения, если его еще никто не обновляет"""
+        token = uuid4().hex
+        lock = LOCK_KEY.format(key)
+        if await self.redis.set(lock, token, nx=True, ex=policy.lock_ttl):
+            self.bg_tasks.add_task(self.refresh, key, loader, token)
+
+    async def refresh(self, key: str, loader: LoaderFactory, token: str) -> None:
+        """Фоновое обновление значения на своей сессии бд.
+
+        Сессия запроса к запуску фоновых задач уже закрыта.
+        """
+        async with async_session_maker() as session:
+            await self.load_and_release(key, loader(session), token)
+
+    async def load_and_release(self, key: str, load: Loader, token: str) -> Any:
+        """Загрузка значения с замером времени и снятие блокировки"""
+        self.load_started[key] = time.monotonic()
+        try:
+            return await load()
+        finally:
+            await self.redis.eval(RELEASE_LOCK_SCRIPT, 1, LOCK_KEY.format(key), token)
+
+    async def set_cache(
+        self,
+        key: str,
+        value: Any,
+        family: str,
+        schema: TypeAdapter,
+        *version_keys: str,
+    ) -> None:
+        """Добавление кэша под ключом с версиями данных, ошибки redis пропускаются"""
+        policy = CACHE_POLICIES[family]
+        try:
+            key = await self.cache_key(key, *version_keys)
+            started = self.load_started.pop(key, None)
+            delta = time.monotonic() - started if started is not None else 0.0
+            data = self.encode(value, schema)
+            digest = hashlib.blake2b(data, digest_size=ENTITY_TAG_SIZE).digest()
+            flag, stored_data = compress(data)
+            expires_at = policy.expires_at()
+            entry = ENTRY_HEADER.pack(expires_at, delta, flag, digest) + stored_data
+            await self.redis.set(key, entry, policy.hard_ttl)
+        except RedisError:
+            logger.warning('Redis is unavailable, %s is not cached', key)
+            return
+        CACHE_SETS.labels(family).inc()
+        CACHE_ENTRY_SIZE.labels(family).observe(len(entry))
+        local_cache.set(
+            key,
+            (
+                entity_tag(digest),
+                expires_at - policy.ttl,
+                data if self.mode == JSON_MODE else value,
+            ),
+        )
+
+    def with_next_cursor(self, result: Any, page: Page) -> Any:
+        """Ответ с заголовком курсора следующей страницы, если она может быть"""
+        if page.limit is None:
+            return result
+        if isinstance(result, Response):
+            if result.status_code != status.HTTP_200_OK:
+                return result
+            cursor = next_cursor(json.loads(result.body), page)
+            headers = result.headers
+        else:
+            cursor = next_cursor(result, page)
+            headers = self.response.headers if self.response is not None else {}
+        if cursor is not None:
+            headers[NEXT_CURSOR_HEADER] = cursor
+        return result
+
+    async def set_not_found(self, key: str, detail: str) -> None:
+        """Добавление короткоживущей записи об отсутствии объекта"""
+        negative_cache_metrics.misses += 1
+        if NEGATIVE_CACHE_TTL <= 0:
+            return
+        header = ENTRY_HEADER.pack(
+            time.time() + NEGATIVE_CACHE_TTL, 0.0, NOT_FOUND, bytes(ENTITY_TAG_SIZE)
+        )
+        try:
+            await self.redis.set(
+                key, header + detail.encode(), math.ceil(NEGATIVE_CACHE_TTL)
+            )
+        except RedisError:
+            logger.warning('Redis is unavailable, %s is not cached', key)
+
+    async def get_or_load(
+        self,
+        key: str,
+        family: str,
+        schema: TypeAdapter,
+        loader: LoaderFactory,
+        *version_keys: str,
+        discounted: bool = False,
+    ) -> Any:
+        """Получение кэша под ключом с версиями данных.
+
+        Значения с блюдами хранятся без скидок, а при discounted=True скидки
+        применяются при чтении. Отсутствие объекта тоже кэшируется на
+        NEGATIVE_CACHE_TTL секунд. При недоступности redis кэш пропускается и
+        значение загружается из бд.
+        """
+
+        def load_or_not_found(session: AsyncSession | None = None) -> Loader:
+            load = loader(session)
+
+            async def load_and_cache_not_found() -> Any:
+                try:
+                    return await load()
+                except HTTPException as exc:
+                    if exc.status_code == status.HTTP_404_NOT_FOUND:
+                        await self.set_not_found(versioned_key, exc.detail)
+                    raise
+
+            return load_and_cache_not_found
+
+        try:
+            discount_keys = (DISCOUNTS_VERSION_KEY,) if discounted else ()
+            versions = await self.versions(*version_keys, *discount_keys)
+            versioned_key = self.remember_versions(key, versions[: len(version_keys)])
+            discounts_version = versions[-1] if discounted else None
+            return await self.get_cache(
+                versioned_key, family, schema, load_or_not_found, discounts_version
+            )
+        except RedisError:
+            logger.warning('Redis is unavailable, %s is loaded bypassing cache', key)
+            return self.to_result(await loader()(), {})
+
+    async def versions(self, *version_keys: str) -> list[int]:
+        """Текущие версии данных из памяти процесса, недостающие одним запросом"""
+        versions: dict[str, int] = {}
+        missing = []
+        for version_key in version_keys:
+            version = local_cache.get(version_key)
+            if version is None:
+                missing.append(version_key)
+            else:
+                versions[version_key] = version
+        if missing:
+            generation = local_cache.generation
+            for version_key, version in zip(missing, await self.redis.mget(missing)):
+                versions[version_key] = int(version or 0)
+                local_cache.set(version_key, versions[version_key], generation)
+        return [versions[version_key] for version_key in version_keys]
+
+    def remember_versions(self, key: str, versions: list[int]) -> str:
+        """Ключ кэша с версиями, запоминаемый для добавления загруженного значения"""
+        self.versioned_keys[key] = key + '@' + '.'.join(map(str, versions))
+        return self.versioned_keys[key]
+
+    async def versioned_key(self, key: str, *version_keys: str) -> str:
+        """Ключ кэша с текущими версиями данных, от которых зависит значение"""
+        return self.remember_versions(key, await self.versions(*version_keys))
+
+    async def cache_key(self, key: str, *version_keys: str) -> str:
+        """Ключ кэша, под которым было запрошено загружаемое значение"""
+        if key in self.versioned_keys:
+            return self.versioned_keys[key]
+        return await self.versioned_key(key, *version_keys)
+
+    def invalidate_versions(self, *version_keys: str) -> None:
+        """Планирование увеличения версий данных"""
+        self.invalidated_versions.update(version_keys)
+
+    async def flush_invalidations(self) -> None:
+        """Увеличение всех запланированных версий одним запросом к redis.
+
+        Если redis недоступен, версии будут увеличены при следующей инвалидации.
+        """
+        if not self.invalidated_versions and not pending_versions:
+            return
+        version_keys = list(self.invalidated_versions | pending_versions)
+        self.invalidated_versions.clear()
+        local_cache.delete(*version_keys)
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                for version_key in version_keys:
+                    pipe.incr(version_key)
+                publish_invalidation(pipe, *version_keys)
+                await pipe.execute()
+        except RedisError:
+            logger.error('Redis is unavailable, cache versions will be bumped later')
+            pending_versions.update(version_keys)
+            return
+        pending_versions.difference_update(version_keys)
+        self.bumped_versions += len(version_keys)
+        for version_key in version_keys:
+            CACHE_INVALIDATIONS.labels(version_key.split('/')[1]).inc()
+
+    async def get_menus_tree_cache(
+        self, loader: LoaderFactory
+    ) -> list[Menu] | Response:
         """Получение кэша эндпойнта get_menus_tree"""
-        cached_menus_tree = await self.redis.get('menus_tree')
-        if cached_menus_tree:
-            return pickle.loads(cached_menus_tree)
-        return None
+        return await self.get_or_load(
+            'menus_tree',
+            MENUS_TREE,
+            MENUS_TREE_SCHEMA,
+            loader,
+            GLOBAL_VERSION_KEY,
+            discounted=True,
+        )
 
-    async def set_menus_tree_cache(self, menus_tree: list[Menu]) -> None:
+    async def set_menus_tree_cache(self, menus_tree: list[Menu] | bytes) -> None:
         """Добавление кэша для эндпойнта get_menus_tree"""
-        await self.redis.set('menus_tree', pickle.dumps(menus_tree), 3600)
+        await self.set_cache(
+            'menus_tree', menus_tree, MENUS_TREE, MENUS_TREE_SCHEMA, GLOBAL_VERSION_KEY
+        )
 
-    async def delete_menus_tree_cache(self) -> None:
+    def invalidate_menus_tree_cache(self) -> None:
         """Удаление кэша эндпойнта get_menus_tree"""
-        await self.redis.delete('menus_tree')
+        self.invalidate_versions(GLOBAL_VERSION_KEY)
 
-    async def get_all_menus_cache(self) -> list[Menu] | None:
-        """Получение кэша эндпойнта get_all_menus"""
-        cached_menus = await self.redis.get(MENU_KEY)
-        if cached_menus:
-            return pickle.loads(cached_menus)
-        return None
+    async def get_all_menus_cache(
+        self, loader: LoaderFactory, page: Page = Page()
+    ) -> list[Menu] | Response:
+        """Получение кэша эндпойнта get_all_menus, отдельного для каждой страницы"""
+        menus = await self.get_or_load(
+            page.cache_key(MENU_KEY),
+            MENUS,
+            MENUS_SCHEMA,
+            loader,
+            GLOBAL_VERSION_KEY,
+        )
+        return self.with_next_cursor(menus, page)
 
-    async def set_all_menus_cache(self, menus: list[Menu]) -> None:
+    async def set_all_menus_cache(self, menus: list[Menu], page: Page = Page()) -> None:
         """Добавление кэша для эндпойнта get_all_menus"""
-        await self.redis.set(MENU_KEY, pickle.dumps(menus), 3600)
+        await self.set_cache(
+            page.cache_key(MENU_KEY), menus, MENUS, MENUS_SCHEMA, GLOBAL_VERSION_KEY
+        )
 
-    async def get_menu_cache(self, menu_id: UUID) -> Menu | None:
+    async def get_menu_cache(
+        self, menu_id: UUID, loader: LoaderFactory
+    ) -> Menu | Response:
         """Получение кэша эндпойнта get_specific_menu"""
-        cached_menu = await self.redis.get(MENU_KEY.format(menu_id))
-        if cached_menu:
-            return pickle.loads(cached_menu)
-        return None
+        return await self.get_or_load(
+            MENU_KEY.format(menu_id),
+            MENUS,
+            MENU_SCHEMA,
+            loader,
+            MENU_VERSION_KEY.format(menu_id),
+        )
 
     async def set_menu_cache(self, menu: Menu) -> None:
         """Добавление кэша для эндпойнта get_specific_menu"""
-        await self.redis.set(MENU_KEY.format(menu.id), pickle.dumps(menu), 3600)
+        await self.set_cache(
+            MENU_KEY.format(menu.id),
+            menu,
+            MENUS,
+            MENU_SCHEMA,
+            MENU_VERSION_KEY.format(menu.id),
+        )
 
-    async def delete_all_menu_cache(self) -> None:
+    def invalidate_all_menu_cache(self) -> None:
         """Удаление кэша эндпойнта get_all_menus"""
-        await self.redis.delete(MENU_KEY)
+        self.invalidate_versions(GLOBAL_VERSION_KEY)
 
-    async def delete_menu_cache(self, menu_id: UUID) -> None:
+    def invalidate_menu_cache(self, menu_id: UUID) -> None:
         """Удаление кэша эндпойнтов get_all_menus и get_specific_menu"""
-        await self.redis.delete(MENU_KEY.format(menu_id))
-        await self.delete_all_menu_cache()
+        self.invalidate_versions(MENU_VERSION_KEY.format(menu_id))
+        self.invalidate_all_menu_cache()
 
-    async def delete_menu_tree_cache(self, menu_id: UUID) -> None:
+    def invalidate_menu_tree_cache(self, menu_id: UUID) -> None:
         """Удаление кэша для всех эндпойнтов связанных с определенным меню"""
-        await self.delete_cache_by_mask(MENU_KEY.format(menu_id))
+        self.invalidate_versions(MENU_VERSION_KEY.format(menu_id))
 
-    async def get_all_submenus_cache(self, menu_id: UUID) -> list[SubMenu] | None:
-        """Получение кэша эндпойнта get_all_submenus"""
-        cached_submenus = await self.redis.get(SUBMENU_KEY.format(menu_id))
-        if cached_submenus:
-            return pickle.loads(cached_submenus)
-        return None
+    async def get_all_submenus_cache(
+        self, menu_id: UUID, loader: LoaderFactory, page: Page = Page()
+    ) -> list[SubMenu] | Response:
+        """Получение кэша эндпойнта get_all_submenus, отдельного для каждой страницы"""
+        submenus = await self.get_or_load(
+            page.cache_key(SUBMENU_KEY.format(menu_id)),
+            SUBMENUS,
+            SUBMENUS_SCHEMA,
+            loader,
+            MENU_VERSION_KEY.format(menu_id),
+        )
+        return self.with_next_cursor(submenus, page)
 
     async def set_all_submenus_cache(
-        self, menu_id: UUID, submenus: list[SubMenu]
+        self, menu_id: UUID, submenus: list[SubMenu], page: Page = Page()
     ) -> None:
         """Добавление кэша для эндпойнта get_all_submenus"""
-        await self.redis.set(SUBMENU_KEY.format(menu_id), pickle.dumps(submenus), 3600)
+        await self.set_cache(
+            page.cache_key(SUBMENU_KEY.format(menu_id)),
+            submenus,
+            SUBMENUS,
+            SUBMENUS_SCHEMA,
+            MENU_VERSION_KEY.format(menu_id),
+        )
 
     async def get_submenu_cache(
-        self, menu_id: UUID, submenu_id: UUID
-    ) -> SubMenu | None:
+        self, menu_id: UUID, submenu_id: UUID, loader: LoaderFactory
+    ) -> SubMenu | Response:
         """Получение кэша эндпойнта get_specific_submenu"""
-        cached_submenu = await self.redis.get(
-            SUBMENU_KEY.format(menu_id) + str(submenu_id)
+        return await self.get_or_load(
+            SUBMENU_KEY.format(menu_id) + str(submenu_id),
+            SUBMENUS,
+            SUBMENU_SCHEMA,
+            loader,
+            MENU_VERSION_KEY.format(menu_id),
+            SUBMENU_VERSION_KEY.format(submenu_id),
         )
-        if cached_submenu:
-            return pickle.loads(cached_submenu)
-        return None
 
     async def set_submenu_cache(self, menu_id: UUID, submenu: SubMenu) -> None:
         """Добавление кэша для эндпойнта get_specific_submenu"""
-        await self.redis.set(
-            SUBMENU_KEY.format(menu_id) + str(submenu.id), pickle.dumps(submenu), 3600
+        await self.set_cache(
+            SUBMENU_KEY.format(menu_id) + str(submenu.id),
+            submenu,
+            SUBMENUS,
+            SUBMENU_SCHEMA,
+            MENU_VERSION_KEY.format(menu_id),
+            SUBMENU_VERSION_KEY.format(submenu.id),
         )
 
-    async def delete_all_submenu_cache(self, menu_id: UUID) -> None:
+    def invalidate_all_submenu_cache(self, menu_id: UUID) -> None:
         """Удаление кэша эндпойнта get_all_submenus и связанных меню"""
-        await self.redis.delete(SUBMENU_KEY.format(menu_id))
-        await self.delete_menu_cache(menu_id)
+        self.invalidate_menu_cache(menu_id)
 
-    async def delete_submenu_cache(self, menu_id: UUID, submenu_id: UUID) -> None:
+    def invalidate_submenu_cache(self, menu_id: UUID, submenu_id: UUID) -> None:
         """Удаление кэша эндпойнтов get_all_submenus и get_specific_submenu и связанных меню"""
-        await self.redis.delete(SUBMENU_KEY.format(menu_id) + str(submenu_id))
-        await self.redis.delete(SUBMENU_KEY.format(menu_id))
+        self.invalidate_versions(
+            MENU_VERSION_KEY.format(menu_id), SUBMENU_VERSION_KEY.format(submenu_id)
+        )
 
-    async def delete_submenu_tree_cache(self, menu_id: UUID, submenu_id: UUID) -> None:
+    def invalidate_submenu_tree_cache(self, menu_id: UUID, submenu_id: UUID) -> None:
         """Удаление кэша для всех эндпойнтов связанных с определенным подменю"""
-        await self.delete_cache_by_mask(SUBMENU_KEY.format(menu_id) + str(submenu_id))
+        self.invalidate_versions(SUBMENU_VERSION_KEY.format(submenu_id))
 
     async def get_all_dishes_cache(
-        self, menu_id: UUID, submenu_id: UUID
-    ) -> list[Dish] | None:
-        """Получение кэша эндпойнта get_all_dishes"""
-        cached_dishes = await self.redis.get(DISH_KEY.format(menu_id, submenu_id))
-        if cached_dishes:
-            return pickle.loads(cached_dishes)
-        return None
+        self,
+        menu_id: UUID,
+        submenu_id: UUID,
+        loader: LoaderFactory,
+        page: DishPage = DishPage(),
+    ) -> list[Dish] | Response:
+        """Получение кэша эндпойнта get_all_dishes, отдельного для каждой страницы"""
+        dishes = await self.get_or_load(
+            page.cache_key(DISH_KEY.format(menu_id, submenu_id)),
+            DISHES,
+            DISHES_SCHEMA,
+            loader,
+            *dishes_version_keys(menu_id, submenu_id, page),
+            discounted=True,
+        )
+        return self.with_next_cursor(dishes, page)
 
     async def set_all_dishes_cache(
-        self, menu_id: UUID, submenu_id: UUID, dishes: list[Dish]
+        self,
+        menu_id: UUID,
+        submenu_id: UUID,
+        dishes: list[Dish],
+        page: DishPage = DishPage(),
     ) -> None:
         """Добавление кэша для эндпойнта get_all_dishes"""
-        await self.redis.set(
-            DISH_KEY.format(menu_id, submenu_id), pickle.dumps(dishes), 3600
+        await self.set_cache(
+            page.cache_key(DISH_KEY.format(menu_id, submenu_id)),
+            dishes,
+            DISHES,
+            DISHES_SCHEMA,
+            *dishes_version_keys(menu_id, submenu_id, page),
         )
 
     async def get_dish_cache(
-        self, menu_id: UUID, submenu_id: UUID, dish_id: UUID
-    ) -> Dish | None:
+        self, menu_id: UUID, submenu_id: UUID, dish_id: UUID, loader: LoaderFactory
+    ) -> Dish | Response:
         """Получение кэша эндпойнта get_specific_dish"""
-        cached_dish = await self.redis.get(
-            DISH_KEY.format(menu_id, submenu_id) + str(dish_id)
+        return await self.get_or_load(
+            DISH_KEY.format(menu_id, submenu_id) + str(dish_id),
+            DISHES,
+            DISH_SCHEMA,
+            loader,
+            MENU_VERSION_KEY.format(menu_id),
+            SUBMENU_VERSION_KEY.format(submenu_id),
+            discounted=True,
         )
-        if cached_dish:
-            return pickle.loads(cached_dish)
-        return None
 
     async def set_dish_cache(self, menu_id: UUID, submenu_id: UUID, dish: Dish) -> None:
         """Добавление кэша для эндпойнта get_specific_dish"""
-        await self.redis.set(
+        await self.set_cache(
             DISH_KEY.format(menu_id, submenu_id) + str(dish.id),
-            pickle.dumps(dish),
-            3600,
+            dish,
+            DISHES,
+            DISH_SCHEMA,
+            MENU_VERSION_KEY.format(menu_id),
+            SUBMENU_VERSION_KEY.format(submenu_id),
         )
 
-    async def delete_all_dishes_cache(self, menu_id: UUID, submenu_id: UUID) -> None:
+    def invalidate_all_dishes_cache(self, menu_id: UUID, submenu_id: UUID) -> None:
         """Удаление кэша для всех эндпойнтов связанных с определенным блюда"""
-        await self.redis.delete(DISH_KEY.format(menu_id, submenu_id))
-        await self.delete_all_submenu_cache(menu_id)
-        await self.delete_submenu_cache(menu_id, submenu_id)
+        self.invalidate_versions(SUBMENU_VERSION_KEY.format(submenu_id))
+        self.invalidate_all_submenu_cache(menu_id)
 
-    async def delete_dish_cache(
+    def invalidate_dish_cache(
         self, menu_id: UUID, submenu_id: UUID, dish_id: UUID
     ) -> None:
         """Удаление кэша для всех эндпойнтов связанных с определенным блюда"""
-        await self.redis.delete(DISH_KEY.format(menu_id, submenu_id) + str(dish_id))
-        await self.redis.delete(DISH_KEY.format(menu_id, submenu_id))
+        self.invalidate_versions(SUBMENU_VERSION_KEY.format(submenu_id))
+
+
+def get_cache_repo(
+    bg_tasks: BackgroundTasks,
+    request: Request,
+    response: Response,
+    redis: Redis = Depends(get_redis),
+    replica: Redis = Depends(get_redis_replica),
+) -> CacheRepo:
+    """Cache репозиторий запроса, отвечающий на условные GET запросы"""
+    cache_repo = CacheRepo(bg_tasks, redis)
+    cache_repo.replica = replica
+    cache_repo.request = request
+    cache_repo.response = response
+    return cache_repo
@@ -0,0 +1,104 @@
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+from redis.exceptions import ConnectionError, TimeoutError
+
+from src.caching.metrics import REDIS_LATENCY
+
+
+class CircuitOpenError(ConnectionError):
+    """Redis недоступен, запрос отклонен без обращения к серверу"""
+
+
+class CircuitBreaker:
+    """Размыкатель цепи для обращений к redis.
+
+    После failure_threshold ошибок соединения подряд все запросы сразу
+    отклоняются с CircuitOpenError. Раз в reset_timeout секунд один запрос
+    пропускается для проверки, и первый успешный замыкает цепь.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """Отклоняются ли сейчас запросы"""
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        """Можно ли выполнить запрос"""
+        if self.opened_at is None:
+            return True
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return False
+        self.opened_at = time.monotonic()
+        return True
+
+    def record_success(self) -> None:
+        """Учет успешного запроса"""
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        """Учет ошибки соединения"""
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+    async def call(self, func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """Выполнение запроса к redis через размыкатель"""
+        if not self.allow():
+            raise CircuitOpenError('Redis circuit is open')
+        try:
+            result = await func(*args)
+        except (ConnectionError, TimeoutError):
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+
+class CircuitBreakerPipeline(Pipeline):
+    """Pipeline, выполняемый через размыкатель цепи с замером времени"""
+
+    breaker: CircuitBreaker
+
+    async def execute(self, raise_on_error: bool = True) -> list:
+        command = 'MULTI' if self.is_transaction else 'PIPELINE'
+        with REDIS_LATENCY.labels(command).time():
+            return await self.breaker.call(super().execute, raise_on_error)
+
+
+class CircuitBreakerRedis(Redis):
+    """Клиент redis, команды которого выполняются через размыкатель цепи.
+
+    Время выполнения команд и pipeline попадает в метрику REDIS_LATENCY.
+    """
+
+    def __init__(self, *, breaker: CircuitBreaker, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.breaker = breaker
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        with REDIS_LATENCY.labels(args[0]).time():
+            return await self.breaker.call(
+                lambda: super(CircuitBreakerRedis, self).execute_command(
+                    *args, **options
+                )
+            )
+
+    def pipeline(
+        self, transaction: bool = True, shard_hint: str | None = None
+    ) -> CircuitBreakerPipeline:
+        pipeline = CircuitBreakerPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+        pipeline.breaker = self.breaker
+        return pipeline
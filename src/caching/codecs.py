@@ -0,0 +1,59 @@
+from typing import Any, Protocol
+from uuid import UUID
+
+import msgpack
+from pydantic import TypeAdapter
+
+UUID_EXT_TYPE = 1
+
+
+class Codec(Protocol):
+    """Сериализация значений кэша по схеме ответа эндпойнта"""
+
+    def encode(self, value: Any, schema: TypeAdapter) -> bytes:
+        """Сериализация ORM объектов или моделей pydantic"""
+
+    def decode(self, data: bytes, schema: TypeAdapter) -> Any:
+        """Десериализация в модели pydantic"""
+
+
+class JSONCodec:
+    """JSON, совпадающий с телом ответа эндпойнта"""
+
+    def encode(self, value: Any, schema: TypeAdapter) -> bytes:
+        """Сериализация ORM объектов или моделей pydantic"""
+        return schema.dump_json(schema.validate_python(value, from_attributes=True))
+
+    def decode(self, data: bytes, schema: TypeAdapter) -> Any:
+        """Десериализация в модели pydantic"""
+        return schema.validate_json(data)
+
+
+def pack_uuid(value: Any) -> msgpack.ExtType:
+    """Упаковка UUID в 16 байт вместо строки из 36 символов"""
+    if isinstance(value, UUID):
+        return msgpack.ExtType(UUID_EXT_TYPE, value.bytes)
+    raise TypeError(f'Cannot serialize {type(value).__name__}')
+
+
+def unpack_uuid(code: int, data: bytes) -> Any:
+    """Распаковка UUID, упакованного pack_uuid"""
+    if code == UUID_EXT_TYPE:
+        return UUID(bytes=data)
+    return msgpack.ExtType(code, data)
+
+
+class MsgpackCodec:
+    """Msgpack со словарями полей схемы и UUID в виде 16 байт"""
+
+    def encode(self, value: Any, schema: TypeAdapter) -> bytes:
+        """Сериализация ORM объектов или моделей pydantic"""
+        data = schema.dump_python(schema.validate_python(value, from_attributes=True))
+        return msgpack.packb(data, default=pack_uuid)
+
+    def decode(self, data: bytes, schema: TypeAdapter) -> Any:
+        """Десериализация в модели pydantic"""
+        return schema.validate_python(msgpack.unpackb(data, ext_hook=unpack_uuid))
+
+
+CODECS: dict[str, Codec] = {'json': JSONCodec(), 'msgpack': MsgpackCodec()}
@@ -0,0 +1,57 @@
+import time
+import zlib
+from dataclasses import dataclass
+
+from prometheus_client import REGISTRY
+
+from src.caching.metrics import StatsCollector
+from src.config import CACHE_COMPRESSION_LEVEL, CACHE_COMPRESSION_THRESHOLD
+
+RAW = 0
+ZLIB = 1
+
+
+@dataclass
+class CompressionMetrics:
+    """Счетчики сжатия значений кэша в рамках процесса"""
+
+    values_total: int = 0
+    compressed_total: int = 0
+    raw_bytes: int = 0
+    stored_bytes: int = 0
+    compress_seconds: float = 0.0
+    decompress_seconds: float = 0.0
+
+
+compression_metrics = CompressionMetrics()
+REGISTRY.register(StatsCollector('cache_compression', compression_metrics))
+
+
+def compress(data: bytes) -> tuple[int, bytes]:
+    """Сжатие значения больше порога, возвращает флаг формата и данные"""
+    metrics = compression_metrics
+    metrics.values_total += 1
+    metrics.raw_bytes += len(data)
+    if CACHE_COMPRESSION_THRESHOLD <= 0 or len(data) < CACHE_COMPRESSION_THRESHOLD:
+        metrics.stored_bytes += len(data)
+        return RAW, data
+
+    start = time.perf_counter()
+    compressed = zlib.compress(data, CACHE_COMPRESSION_LEVEL)
+    metrics.compress_seconds += time.perf_counter() - start
+    if len(compressed) >= len(data):
+        metrics.stored_bytes += len(data)
+        return RAW, data
+    metrics.compressed_total += 1
+    metrics.stored_bytes += len(compressed)
+    return ZLIB, compressed
+
+
+def decompress(flag: int, data: bytes) -> bytes:
+    """Распаковка значения по флагу формата"""
+    if flag == RAW:
+        return data
+    start = time.perf_counter()
+    data = zlib.decompress(data)
+    compression_metrics.decompress_seconds += time.perf_counter() - start
+    return data
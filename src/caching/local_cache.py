@@ -0,0 +1,243 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline, PubSub
+from redis.asyncio.connection import Connection
+from redis.exceptions import ConnectionError, RedisError, ResponseError
+
+from src.caching.metrics import LOCAL_CACHE_ENTRIES
+from src.config import (
+    INVALIDATION_STREAM_MAXLEN,
+    LOCAL_CACHE_SIZE,
+    LOCAL_CACHE_TRACKED_TTL,
+    LOCAL_CACHE_TTL,
+    REDIS_CLIENT_TRACKING,
+)
+
+INVALIDATION_STREAM = 'cache/invalidations'
+INVALIDATION_READ_COUNT = 100
+INVALIDATION_BLOCK_MS = 5000
+TRACKING_CHANNEL = '__redis__:invalidate'
+TRACKED_PREFIXES = ('versions/', 'discounts/')
+FLUSH_ALL = '*'
+
+logger = logging.getLogger(__name__)
+
+
+class LocalCache:
+    """LRU кэш в памяти процесса, ограниченный по размеру и времени жизни"""
+
+    def __init__(self, maxsize: int, ttl: float, tracked_ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.tracked_ttl = tracked_ttl
+        self.tracked_prefixes: tuple[str, ...] = ()
+        self.generation = 0
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Any | None:
+        """Получение значения, None если его нет или оно устарело"""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, generation: int | None = None) -> None:
+        """Добавление значения с вытеснением самых старых записей.
+
+        Значение, прочитанное из redis до поколения generation, не добавляется,
+        если после чтения были инвалидации. Ключи, изменения которых отслеживает
+        redis, хранятся дольше.
+        """
+        if self.maxsize <= 0 or generation not in (None, self.generation):
+            return
+        if key.startswith(self.tracked_prefixes):
+            ttl = self.tracked_ttl
+        else:
+            ttl = self.ttl
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        """Удаление значений по ключам"""
+        self.generation += 1
+        for key in keys:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Удаление всех значений"""
+        self.generation += 1
+        self._data.clear()
+
+    def apply_invalidation(self, message: bytes | str) -> None:
+        """Применение события об инвалидации из потока redis"""
+        keys = json.loads(message)
+        if FLUSH_ALL in keys:
+            self.clear()
+        else:
+            self.delete(*keys)
+
+    def apply_tracking(self, keys: list[bytes] | None) -> None:
+        """Применение сообщения redis об изменении отслеживаемых ключей"""
+        if keys is None:
+            self.clear()
+        else:
+            self.delete(*(key.decode() for key in keys))
+
+
+local_cache = LocalCache(LOCAL_CACHE_SIZE, LOCAL_CACHE_TTL, LOCAL_CACHE_TRACKED_TTL)
+LOCAL_CACHE_ENTRIES.set_function(lambda: len(local_cache))
+
+
+def invalidation_message(*keys: str) -> str:
+    """Сообщение об инвалидации ключей для остальных процессов"""
+    return json.dumps(keys)
+
+
+def publish_invalidation(pipe: Pipeline, *keys: str) -> None:
+    """Добавление события инвалидации ключей в поток INVALIDATION_STREAM"""
+    pipe.xadd(
+        INVALIDATION_STREAM,
+        {'keys': invalidation_message(*keys)},
+        maxlen=INVALIDATION_STREAM_MAXLEN,
+        approximate=True,
+    )
+
+
+def stream_id(message_id: bytes | str) -> tuple[int, int]:
+    """Разбор id события потока для сравнения"""
+    if isinstance(message_id, bytes):
+        message_id = message_id.decode()
+    milliseconds, sequence = message_id.split('-')
+    return int(milliseconds), int(sequence)
+
+
+async def last_invalidation_id(redis: Redis) -> bytes | str:
+    """Id последнего события в потоке инвалидаций"""
+    messages = await redis.xrevrange(INVALIDATION_STREAM, count=1)
+    return messages[0][0] if messages else '0-0'
+
+
+async def invalidations_lost(redis: Redis, last_id: bytes | str) -> bool:
+    """Были ли события после last_id вытеснены из потока по MAXLEN"""
+    messages = await redis.xrange(INVALIDATION_STREAM, count=1)
+    return bool(messages) and stream_id(messages[0][0]) > stream_id(last_id)
+
+
+async def consume_invalidations(redis: Redis) -> None:
+    """Чтение потока инвалидаций из других процессов.
+
+    После переподключения чтение продолжается с последнего прочитанного
+    события, так что пропущенные инвалидации применяются. Кэш процесса
+    очищается только при первом подключении, если нужные события уже
+    вытеснены из потока и если событие не удалось применить.
+    """
+    last_id = None
+    while True:
+        try:
+            if last_id is None:
+                last_id = await last_invalidation_id(redis)
+                local_cache.clear()
+            elif await invalidations_lost(redis, last_id):
+                logger.warning('Invalidations were trimmed, local cache is cleared')
+                local_cache.clear()
+            while True:
+                streams = await redis.xread(
+                    {INVALIDATION_STREAM: last_id},
+                    count=INVALIDATION_READ_COUNT,
+                    block=INVALIDATION_BLOCK_MS,
+                )
+                for _, messages in streams:
+                    for message_id, fields in messages:
+                        last_id = message_id
+                        local_cache.apply_invalidation(fields[b'keys'])
+        except ConnectionError:
+            logger.warning('Lost connection to redis, invalidations will be replayed')
+            await asyncio.sleep(1)
+        except RedisError:
+            logger.exception('Failed to read invalidations, retrying')
+            await asyncio.sleep(1)
+        except Exception:
+            logger.exception('Failed to apply invalidation, local cache is cleared')
+            local_cache.clear()
+            await asyncio.sleep(1)
+
+
+async def enable_tracking(redis: Redis, pubsub: PubSub) -> Connection | None:
+    """Включение отслеживания ключей с префиксами TRACKED_PREFIXES сервером redis.
+
+    Об изменении этих ключей redis сам сообщает в канал TRACKING_CHANNEL
+    соединения подписки. Возвращает соединение, на котором включено
+    отслеживание, или None, если redis его не поддерживает.
+    """
+    await pubsub.execute_command('CLIENT', 'ID')
+    client_id = await pubsub.parse_response(block=True)
+    connection = await redis.connection_pool.get_connection('CLIENT')
+    prefixes = [arg for prefix in TRACKED_PREFIXES for arg in ('PREFIX', prefix)]
+    try:
+        await connection.send_command(
+            'CLIENT', 'TRACKING', 'ON', 'REDIRECT', client_id, 'BCAST', *prefixes
+        )
+        await connection.read_response()
+    except ResponseError:
+        logger.info('Redis does not support client tracking')
+        await redis.connection_pool.release(connection)
+        return None
+    return connection
+
+
+async def listen_tracking(redis: Redis) -> None:
+    """Подписка на сообщения redis об изменении отслеживаемых ключей.
+
+    Пока отслеживание включено, версии хранятся в кэше процесса дольше.
+    """
+    while True:
+        tracking = None
+        try:
+            async with redis.pubsub() as pubsub:
+                tracking = await enable_tracking(redis, pubsub)
+                if tracking is None:
+                    return
+                await pubsub.subscribe(TRACKING_CHANNEL)
+                local_cache.tracked_prefixes = TRACKED_PREFIXES
+                async for message in pubsub.listen():
+                    if message['type'] == 'message':
+                        local_cache.apply_tracking(message['data'])
+        except ConnectionError:
+            logger.warning('Lost connection to redis, client tracking is disabled')
+            await asyncio.sleep(1)
+        except RedisError:
+            logger.exception('Client tracking failed, retrying')
+            await asyncio.sleep(1)
+        except Exception:
+            logger.exception('Client tracking failed, local cache is cleared')
+            local_cache.clear()
+            await asyncio.sleep(1)
+        finally:
+            local_cache.tracked_prefixes = ()
+            if tracking is not None:
+                await tracking.disconnect()
+                await redis.connection_pool.release(tracking)
+
+
+async def listen_invalidations(redis: Redis) -> None:
+    """Получение инвалидаций кэша из других процессов и от redis"""
+    listeners = [consume_invalidations(redis)]
+    if REDIS_CLIENT_TRACKING:
+        listeners.append(listen_tracking(redis))
+    await asyncio.gather(*listeners)
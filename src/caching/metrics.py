@@ -0,0 +1,47 @@
+from collections.abc import Iterator
+from dataclasses import fields
+from typing import Any
+
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily
+
+SIZE_BUCKETS = tuple(256 * 4**power for power in range(9))
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+
+CACHE_HITS = Counter(
+    'cache_hits', 'Cache hits by key family and layer', ['family', 'layer']
+)
+CACHE_MISSES = Counter('cache_misses', 'Cache misses by key family', ['family'])
+CACHE_SETS = Counter('cache_sets', 'Cache writes by key family', ['family'])
+CACHE_ENTRY_SIZE = Histogram(
+    'cache_entry_size_bytes',
+    'Size of cache entries written to redis',
+    ['family'],
+    buckets=SIZE_BUCKETS,
+)
+CACHE_INVALIDATIONS = Counter(
+    'cache_invalidations', 'Bumped cache data versions by scope', ['scope']
+)
+LOCAL_CACHE_ENTRIES = Gauge('local_cache_entries', 'Entries in the in-process cache')
+REDIS_LATENCY = Histogram(
+    'redis_command_duration_seconds',
+    'Duration of redis commands and pipelines',
+    ['command'],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+class StatsCollector:
+    """Экспорт полей dataclass со счетчиками как метрик prometheus"""
+
+    def __init__(self, prefix: str, stats: Any) -> None:
+        self.prefix = prefix
+        self.stats = stats
+
+    def collect(self) -> Iterator[CounterMetricFamily]:
+        for field in fields(self.stats):
+            yield CounterMetricFamily(
+                f'{self.prefix}_{field.name}',
+                f'{type(self.stats).__doc__}: {field.name}',
+                value=getattr(self.stats, field.name),
+            )
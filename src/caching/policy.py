@@ -0,0 +1,62 @@
+import math
+import random
+import time
+from dataclasses import dataclass
+
+from src.config import (
+    CACHE_BETA,
+    CACHE_FAMILIES,
+    CACHE_LOCK_TTL,
+    CACHE_STALE_TTL,
+    CACHE_TTL,
+)
+
+MENUS = 'menus'
+SUBMENUS = 'submenus'
+DISHES = 'dishes'
+MENUS_TREE = 'menus_tree'
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Время жизни записей одного семейства ключей кэша.
+
+    ttl - время, в течение которого запись свежая, stale_ttl - сколько еще
+    после этого отдается устаревшая запись, пока она обновляется в фоне,
+    beta - коэффициент вероятностного досрочного обновления (XFetch),
+    0 его отключает, lock_ttl - время блокировки загрузки значения, которое
+    должно быть больше самой долгой загрузки, иначе ожидающие запросы
+    загрузят значение сами.
+    """
+
+    ttl: float
+    stale_ttl: float
+    beta: float
+    lock_ttl: int = 10
+
+    @property
+    def hard_ttl(self) -> int:
+        """Время хранения записи в redis"""
+        return math.ceil(self.ttl + self.stale_ttl)
+
+    def expires_at(self) -> float:
+        """Момент, после которого новая запись перестанет быть свежей"""
+        return time.time() + self.ttl
+
+    def needs_refresh(self, expires_at: float, delta: float) -> bool:
+        """Нужно ли обновить запись, delta - время ее последнего вычисления"""
+        now = time.time()
+        if self.beta > 0 and delta > 0:
+            now -= delta * self.beta * math.log(1 - random.random())
+        return now >= expires_at
+
+
+CACHE_POLICIES = {
+    family: CachePolicy(
+        CACHE_TTL[family],
+        CACHE_STALE_TTL[family],
+        CACHE_BETA[family],
+        CACHE_LOCK_TTL[family],
+    )
+    for family in CACHE_FAMILIES
+}
@@ -0,0 +1,24 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+Loader = Callable[[], Awaitable[Any]]
+
+
+class SingleFlight:
+    """Объединение одновременных вычислений одного ключа в рамках процесса"""
+
+    def __init__(self) -> None:
+        self._calls: dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, load: Loader) -> Any:
+        """Выполнение load, либо ожидание уже запущенного вычисления ключа"""
+        call = self._calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(load())
+            self._calls[key] = call
+            call.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(call)
+
+
+single_flight = SingleFlight()
@@ -0,0 +1,66 @@
+import asyncio
+import logging
+from uuid import UUID
+
+from fastapi import BackgroundTasks
+from redis.asyncio import Redis
+
+from src.api.dish.crud_repo import DishCRUDRepo
+from src.api.dish.service_repo import DishServiceRepo
+from src.api.menu.crud_repo import MenuCRUDRepo
+from src.api.menu.service_repo import MenuServiceRepo
+from src.caching.cache_repo import MENUS_TREE_SCHEMA, CacheRepo
+from src.config import CACHE_WARM_UP_CONCURRENCY
+from src.database import async_session_maker
+from src.model_definitions.models import Menu
+from src.schemas.menus_tree_schemas import MenusTreeMenuOutput
+
+logger = logging.getLogger(__name__)
+
+cache_ready = asyncio.Event()
+
+
+async def warm_up_cache(redis: Redis) -> None:
+    """Заполнение кэша дерева меню, списка меню и списков блюд всех подменю"""
+    semaphore = asyncio.Semaphore(CACHE_WARM_UP_CONCURRENCY)
+
+    def cache_repo() -> CacheRepo:
+        return CacheRepo(BackgroundTasks(), redis)
+
+    async def warm_up_menus() -> None:
+        async with semaphore, async_session_maker() as session:
+            await MenuServiceRepo(MenuCRUDRepo(session), cache_repo()).load_all_menus()
+
+    async def warm_up_dishes(menu_id: UUID, submenu_id: UUID) -> None:
+        async with semaphore, async_session_maker() as session:
+            await DishServiceRepo(DishCRUDRepo(session), cache_repo()).load_all_dishes(
+                menu_id, submenu_id
+            )
+
+    async with async_session_maker() as session:
+        loaded_tree = await MenuServiceRepo(
+            MenuCRUDRepo(session), cache_repo()
+        ).load_menus_tree()
+    menus_tree: list[Menu] | list[MenusTreeMenuOutput]
+    if isinstance(loaded_tree, bytes):
+        menus_tree = MENUS_TREE_SCHEMA.validate_json(loaded_tree)
+    else:
+        menus_tree = loaded_tree
+    submenus = [
+        (menu.id, submenu.id) for menu in menus_tree for submenu in menu.submenus
+    ]
+    await asyncio.gather(
+        warm_up_menus(),
+        *(warm_up_dishes(menu_id, submenu_id) for menu_id, submenu_id in submenus),
+    )
+    logger.info('Cache is warmed up for %s submenus', len(submenus))
+
+
+async def warm_up_on_startup(redis: Redis) -> None:
+    """Прогрев кэша при старте приложения, после которого оно считается готовым"""
+    try:
+        await warm_up_cache(redis)
+    except Exception:
+        logger.exception('Cache warm up failed, serving requests with cold cache')
+    finally:
+        cache_ready.set()
@@ -17,8 +17,55 @@ RABBITMQ_DEFAULT_PORT = os.getenv('RABBITMQ_DEFAULT_PORT')
 RABBITMQ_HOST = os.getenv('RABBITMQ_HOST')
 
 REDIS_URL = f'redis://{REDIS_HOST}:{REDIS_PORT}'
+REDIS_REPLICA_URL = os.getenv('REDIS_REPLICA_URL')
+REDIS_MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONNECTIONS', 100))
+REDIS_SOCKET_TIMEOUT = float(os.getenv('REDIS_SOCKET_TIMEOUT', 0.5))
+REDIS_SOCKET_CONNECT_TIMEOUT = float(os.getenv('REDIS_SOCKET_CONNECT_TIMEOUT', 0.5))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv('REDIS_HEALTH_CHECK_INTERVAL', 30))
+REDIS_BREAKER_FAILURES = int(os.getenv('REDIS_BREAKER_FAILURES', 5))
+REDIS_BREAKER_RESET_TIMEOUT = float(os.getenv('REDIS_BREAKER_RESET_TIMEOUT', 10))
+REDIS_CLIENT_TRACKING = os.getenv('REDIS_CLIENT_TRACKING', 'true').lower() == 'true'
+
+LOCAL_CACHE_SIZE = int(os.getenv('LOCAL_CACHE_SIZE', 1024))
+LOCAL_CACHE_TTL = float(os.getenv('LOCAL_CACHE_TTL', 30))
+LOCAL_CACHE_TRACKED_TTL = float(os.getenv('LOCAL_CACHE_TRACKED_TTL', 300))
+INVALIDATION_STREAM_MAXLEN = int(os.getenv('INVALIDATION_STREAM_MAXLEN', 10000))
+CACHE_MODE = os.getenv('CACHE_MODE', 'objects')
+MENUS_TREE_ENGINE = os.getenv('MENUS_TREE_ENGINE', 'orm')
+CACHE_CODEC = os.getenv('CACHE_CODEC', 'msgpack')
+CACHE_COMPRESSION_THRESHOLD = int(os.getenv('CACHE_COMPRESSION_THRESHOLD', 16384))
+CACHE_COMPRESSION_LEVEL = int(os.getenv('CACHE_COMPRESSION_LEVEL', 1))
+CACHE_WARM_UP = os.getenv('CACHE_WARM_UP', 'false').lower() == 'true'
+CACHE_WARM_UP_CONCURRENCY = int(os.getenv('CACHE_WARM_UP_CONCURRENCY', 4))
+NEGATIVE_CACHE_TTL = float(os.getenv('NEGATIVE_CACHE_TTL', 10))
+PAGE_DEFAULT_LIMIT = int(os.getenv('PAGE_DEFAULT_LIMIT', 100))
+PAGE_MAX_LIMIT = int(os.getenv('PAGE_MAX_LIMIT', 100))
+CATALOG_EXPORT_BATCH_SIZE = int(os.getenv('CATALOG_EXPORT_BATCH_SIZE', 1000))
+
+CACHE_FAMILIES = ('menus', 'submenus', 'dishes', 'menus_tree')
+CACHE_TTL = {
+    family: float(os.getenv(f'{family.upper()}_CACHE_TTL', 3600))
+    for family in CACHE_FAMILIES
+}
+CACHE_STALE_TTL = {
+    family: float(os.getenv(f'{family.upper()}_CACHE_STALE_TTL', 300))
+    for family in CACHE_FAMILIES
+}
+CACHE_BETA = {
+    family: float(os.getenv(f'{family.upper()}_CACHE_BETA', 1))
+    for family in CACHE_FAMILIES
+}
+CACHE_LOCK_TTL = {
+    family: int(
+        os.getenv(
+            f'{family.upper()}_CACHE_LOCK_TTL', 30 if family == 'menus_tree' else 10
+        )
+    )
+    for family in CACHE_FAMILIES
+}
 
 MENUS_TREE = '/menus-tree/'
+CATALOG_EXPORT = '/catalog/export/'
 MENUS_URL = '/menus/'
 MENU_URL = '/menus/{target_menu_id}'
 SUBMENUS_URL = '/menus/{target_menu_id}/submenus/'
@@ -1,9 +1,24 @@
 from typing import AsyncGenerator
 
-from aioredis import ConnectionPool, Redis
+from redis.asyncio import ConnectionPool, Redis
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from src.config import DB_HOST, DB_NAME, DB_PASS, DB_PORT, DB_USER, REDIS_URL
+from src.caching.circuit_breaker import CircuitBreaker, CircuitBreakerRedis
+from src.config import (
+    DB_HOST,
+    DB_NAME,
+    DB_PASS,
+    DB_PORT,
+    DB_USER,
+    REDIS_BREAKER_FAILURES,
+    REDIS_BREAKER_RESET_TIMEOUT,
+    REDIS_HEALTH_CHECK_INTERVAL,
+    REDIS_MAX_CONNECTIONS,
+    REDIS_REPLICA_URL,
+    REDIS_SOCKET_CONNECT_TIMEOUT,
+    REDIS_SOCKET_TIMEOUT,
+    REDIS_URL,
+)
 
 DATABASE_URL = f'postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
 
@@ -19,9 +34,38 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
-pool = ConnectionPool.from_url(REDIS_URL)
+def create_redis_pool(url: str) -> ConnectionPool:
+    """Пул соединений с redis с ограничением размера и таймаутами"""
+    return ConnectionPool.from_url(
+        url,
+        max_connections=REDIS_MAX_CONNECTIONS,
+        socket_timeout=REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=REDIS_SOCKET_CONNECT_TIMEOUT,
+        health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+    )
+
+
+pool = create_redis_pool(REDIS_URL)
+breaker = CircuitBreaker(REDIS_BREAKER_FAILURES, REDIS_BREAKER_RESET_TIMEOUT)
+if REDIS_REPLICA_URL:
+    replica_pool = create_redis_pool(REDIS_REPLICA_URL)
+    replica_breaker = CircuitBreaker(
+        REDIS_BREAKER_FAILURES, REDIS_BREAKER_RESET_TIMEOUT
+    )
+else:
+    replica_pool, replica_breaker = pool, breaker
 
 
 def get_redis() -> Redis:
     """Соединение с redis"""
-    return Redis(connection_pool=pool)
+    return CircuitBreakerRedis(connection_pool=pool, breaker=breaker)
+
+
+def get_redis_replica() -> Redis:
+    """Соединение с репликой redis для чтения кэша, без реплики - с основным redis"""
+    return CircuitBreakerRedis(connection_pool=replica_pool, breaker=replica_breaker)
+
+
+def get_pubsub_redis() -> Redis:
+    """Соединение с redis без таймаута чтения для подписки на каналы"""
+    return Redis.from_url(REDIS_URL, health_check_interval=REDIS_HEALTH_CHECK_INTERVAL)
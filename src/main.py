@@ -1,13 +1,72 @@
-from fastapi import FastAPI
+import asyncio
+
+from fastapi import FastAPI, Response, status
 from fastapi.staticfiles import StaticFiles
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from src.api.dish.dish_router import dish_router
 from src.api.menu.menu_router import menu_router
 from src.api.submenu.submenu_router import submenu_router
+from src.caching.local_cache import listen_invalidations
+from src.caching.warm_up import cache_ready, warm_up_on_startup
+from src.config import CACHE_WARM_UP
+from src.database import get_pubsub_redis, get_redis
 
 app = FastAPI(title='Y_lab_FastAPI')
 
 
+@app.on_event('startup')
+async def start_invalidation_listener() -> None:
+    """Запуск подписки на инвалидации кэша памяти процесса"""
+    app.state.invalidation_listener = asyncio.create_task(
+        listen_invalidations(get_pubsub_redis())
+    )
+
+
+@app.on_event('startup')
+async def start_cache_warm_up() -> None:
+    """Запуск прогрева кэша, если он включен"""
+    if CACHE_WARM_UP:
+        app.state.cache_warm_up = asyncio.create_task(warm_up_on_startup(get_redis()))
+    else:
+        cache_ready.set()
+
+
+@app.on_event('shutdown')
+async def stop_invalidation_listener() -> None:
+    """Остановка подписки на инвалидации кэша памяти процесса"""
+    app.state.invalidation_listener.cancel()
+
+
+@app.on_event('shutdown')
+async def stop_cache_warm_up() -> None:
+    """Остановка незавершенного прогрева кэша"""
+    if CACHE_WARM_UP:
+        app.state.cache_warm_up.cancel()
+
+
+@app.get('/ready', include_in_schema=False)
+async def readiness() -> Response:
+    """Проверка готовности приложения.
+
+    503, пока кэш прогревается или если подписка на инвалидации остановилась.
+    """
+    listener = getattr(app.state, 'invalidation_listener', None)
+    if listener is not None and listener.done():
+        return Response(status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    if cache_ready.is_set():
+        return Response(status_code=status.HTTP_200_OK)
+    return Response(status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+@app.get('/metrics', include_in_schema=False)
+async def metrics() -> Response:
+    """Метрики кэша и redis в текстовом формате prometheus"""
+    return Response(
+        content=generate_latest(), headers={'Content-Type': CONTENT_TYPE_LATEST}
+    )
+
+
 app.include_router(menu_router)
 app.include_router(submenu_router)
 app.include_router(dish_router)
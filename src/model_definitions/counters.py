@@ -0,0 +1,85 @@
+"""Триггеры, поддерживающие счетчики подменю и блюд в актуальном состоянии"""
+
+from sqlalchemy import DDL, text
+
+COUNT_DISHES_FUNCTION = DDL(
+    """
+CREATE OR REPLACE FUNCTION count_dishes() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE submenus SET dishes_count = dishes_count - 1
+        WHERE id = OLD.submenu_id;
+        UPDATE menus SET dishes_count = menus.dishes_count - 1
+        FROM submenus
+        WHERE submenus.id = OLD.submenu_id AND menus.id = submenus.menu_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE submenus SET dishes_count = dishes_count + 1
+        WHERE id = NEW.submenu_id;
+        UPDATE menus SET dishes_count = menus.dishes_count + 1
+        FROM submenus
+        WHERE submenus.id = NEW.submenu_id AND menus.id = submenus.menu_id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+)
+COUNT_DISHES_TRIGGER = DDL(
+    """
+CREATE TRIGGER count_dishes
+AFTER INSERT OR DELETE OR UPDATE OF submenu_id ON dishes
+FOR EACH ROW EXECUTE FUNCTION count_dishes()
+"""
+)
+
+COUNT_SUBMENUS_FUNCTION = DDL(
+    """
+CREATE OR REPLACE FUNCTION count_submenus() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE menus
+        SET submenus_count = submenus_count - 1,
+            dishes_count = dishes_count - OLD.dishes_count
+        WHERE id = OLD.menu_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE menus
+        SET submenus_count = submenus_count + 1,
+            dishes_count = dishes_count + NEW.dishes_count
+        WHERE id = NEW.menu_id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+)
+COUNT_SUBMENUS_TRIGGER = DDL(
+    """
+CREATE TRIGGER count_submenus
+AFTER INSERT OR DELETE OR UPDATE OF menu_id ON submenus
+FOR EACH ROW EXECUTE FUNCTION count_submenus()
+"""
+)
+
+BACKFILL_COUNTERS = (
+    text(
+        """
+UPDATE submenus SET dishes_count = (
+    SELECT count(*) FROM dishes WHERE dishes.submenu_id = submenus.id
+)
+"""
+    ),
+    text(
+        """
+UPDATE menus SET
+    submenus_count = (
+        SELECT count(*) FROM submenus WHERE submenus.menu_id = menus.id
+    ),
+    dishes_count = (
+        SELECT coalesce(sum(submenus.dishes_count), 0) FROM submenus
+        WHERE submenus.menu_id = menus.id
+    )
+"""
+    ),
+)
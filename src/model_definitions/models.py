@@ -1,9 +1,25 @@
 import uuid
 from typing import Any
 
-from sqlalchemy import Column, ForeignKey, MetaData, Numeric, String, Text, func, select
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    Integer,
+    MetaData,
+    Numeric,
+    String,
+    Text,
+    event,
+)
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import column_property, declarative_base, relationship
+from sqlalchemy.orm import declarative_base, relationship
+
+from src.model_definitions.counters import (
+    COUNT_DISHES_FUNCTION,
+    COUNT_DISHES_TRIGGER,
+    COUNT_SUBMENUS_FUNCTION,
+    COUNT_SUBMENUS_TRIGGER,
+)
 
 metadata = MetaData()
 Base: Any = declarative_base(metadata=metadata)
@@ -49,12 +65,7 @@ class SubMenu(Base):
     dishes = relationship(
         'Dish', back_populates='submenu', cascade='all, delete-orphan'
     )
-    dishes_count = column_property(
-        select(func.count(Dish.id))
-        .where(Dish.submenu_id == id)
-        .correlate_except(Dish)
-        .scalar_subquery()
-    )
+    dishes_count = Column(Integer, nullable=False, server_default='0')
 
 
 class Menu(Base):
@@ -75,17 +86,11 @@ class Menu(Base):
     submenus = relationship(
         'SubMenu', back_populates='menu', cascade='all, delete-orphan'
     )
-    submenus_count = column_property(
-        select(func.count(SubMenu.id))
-        .where(SubMenu.menu_id == id)
-        .correlate_except(SubMenu)
-        .scalar_subquery()
-    )
+    submenus_count = Column(Integer, nullable=False, server_default='0')
+    dishes_count = Column(Integer, nullable=False, server_default='0')
 
-    dishes_count = column_property(
-        select(func.count(Dish.id))
-        .join(SubMenu, Dish.submenu_id == SubMenu.id)
-        .where(SubMenu.menu_id == id)
-        .correlate_except(Dish, SubMenu)
-        .scalar_subquery()
-    )
+
+event.listen(SubMenu.__table__, 'after_create', COUNT_SUBMENUS_FUNCTION)
+event.listen(SubMenu.__table__, 'after_create', COUNT_SUBMENUS_TRIGGER)
+event.listen(Dish.__table__, 'after_create', COUNT_DISHES_FUNCTION)
+event.listen(Dish.__table__, 'after_create', COUNT_DISHES_TRIGGER)
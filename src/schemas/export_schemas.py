@@ -0,0 +1,29 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+from src.schemas.dish_schemas import DishOutput
+from src.schemas.menu_schemas import MenuOutput
+from src.schemas.submenu_schemas import SubMenuOutput
+
+
+class MenuExport(MenuOutput):
+    """Строка выгрузки каталога с меню"""
+    type: Literal['menu'] = 'menu'
+
+
+class SubMenuExport(SubMenuOutput):
+    """Строка выгрузки каталога с подменю"""
+    type: Literal['submenu'] = 'submenu'
+
+
+class DishExport(DishOutput):
+    """Строка выгрузки каталога с блюдом"""
+    type: Literal['dish'] = 'dish'
+
+
+CATALOG_SCHEMAS: dict[str, type[BaseModel]] = {
+    'menu': MenuExport,
+    'submenu': SubMenuExport,
+    'dish': DishExport,
+}
@@ -0,0 +1,31 @@
+from urllib.parse import urlencode
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+class Page(BaseModel):
+    """Модель параметров страницы списка в порядке (title, id)"""
+    model_config = ConfigDict(frozen=True)
+
+    limit: int | None = None
+    cursor: tuple[str, UUID] | None = None
+    title: str | None = None
+
+    def cache_key(self, key: str) -> str:
+        """Ключ кэша страницы, для всего списка - сам key"""
+        params = self.model_dump(mode='json', exclude_none=True)
+        if not params:
+            return key
+        return f'{key}?{urlencode(sorted(params.items()))}'
+
+
+class DishPage(Page):
+    """Модель параметров страницы списка блюд с фильтром по цене со скидкой"""
+    price_min: float | None = None
+    price_max: float | None = None
+
+    @property
+    def by_price(self) -> bool:
+        """Зависит ли страница от цены, а значит и от скидок"""
+        return self.price_min is not None or self.price_max is not None
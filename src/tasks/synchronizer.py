@@ -1,19 +1,43 @@
-import pickle
+import logging
+from collections.abc import Callable
 from uuid import UUID
 
+from fastapi import BackgroundTasks
+
 from src.api.dish.crud_repo import DishCRUDRepo
 from src.api.menu.crud_repo import MenuCRUDRepo
 from src.api.submenu.crud_repo import SubMenuCRUDRepo
+from src.caching.cache_repo import CacheRepo
+from src.caching.warm_up import warm_up_cache
+from src.config import CACHE_WARM_UP
 from src.database import async_session_maker, get_redis
 from src.schemas.dish_schemas import DishInput, DishUpdate
 from src.schemas.menu_schemas import MenuInput, MenuUpdate
 from src.schemas.submenu_schemas import SubMenuInput, SubMenuUpdate
 
+SYNC_METRICS_KEY = 'sync/metrics'
+
+logger = logging.getLogger(__name__)
+
 
 class SynchronizerRepo:
     def __init__(self, parsed_data: list[dict]) -> None:
         self.redis = get_redis()
+        self.cache_repo = CacheRepo(BackgroundTasks(), self.redis)
         self.parsed_data = parsed_data
+        self.discounts: dict[str, int] = {}
+        self.old_discounts: dict[str, int] = {}
+        self.invalidations: set[tuple] = set()
+        self.parse_ids()
+
+    def parse_ids(self) -> None:
+        """Перевод id из таблицы в UUID один раз перед синхронизацией"""
+        for menu in self.parsed_data:
+            menu['id'] = UUID(menu['id'])
+            for submenu in menu['submenus']:
+                submenu['id'] = UUID(submenu['id'])
+                for dish in submenu['dishes']:
+                    dish['id'] = UUID(dish['id'])
 
     async def initialize_repos(self) -> None:
         """Инициализация CRUD репозиториев"""
@@ -22,6 +46,15 @@ class SynchronizerRepo:
             self.submenu_repo = SubMenuCRUDRepo(session)
             self.dish_repo = DishCRUDRepo(session)
 
+    def invalidate(self, invalidate_cache: Callable, *args: UUID) -> None:
+        """Добавление инвалидации кэша, которая выполнится после синхронизации"""
+        self.invalidations.add((invalidate_cache, *args))
+
+    def add_discount(self, dish: dict) -> None:
+        """Запоминание скидки блюда, нулевые скидки не хранятся в кэше"""
+        if dish['discount']:
+            self.discounts[str(dish['id'])] = dish['discount']
+
     async def create_submenus(self, menu_id: UUID, submenus: list) -> None:
         """Добавление нескольких подменю"""
         for submenu in submenus:
@@ -35,7 +68,7 @@ class SynchronizerRepo:
         """Добавление нескольких блюд"""
         for dish in dishes:
             await self.dish_repo.create_dish(submenu_id, DishInput(**dish))
-            await self.redis.set(dish['id'], pickle.dumps(dish['discount']))
+            self.add_discount(dish)
 
     async def sync_menu(self, menu: dict) -> None:
         """Синхронизвция определенного меню"""
@@ -44,6 +77,7 @@ class SynchronizerRepo:
         del menu_copy['id']
         if db_menu.title != menu['title'] or db_menu.description != menu['description']:
             await self.menu_repo.update_menu(menu['id'], MenuUpdate(**menu_copy))
+            self.invalidate(self.cache_repo.invalidate_menu_cache, menu['id'])
 
     async def sync_submenu(self, menu_id: UUID, submenu: dict) -> None:
         """Синхронизвция определенного подменю"""
@@ -59,6 +93,9 @@ class SynchronizerRepo:
             await self.submenu_repo.update_submenu(
                 menu_id, submenu['id'], SubMenuUpdate(**submenu_copy)
             )
+            self.invalidate(
+                self.cache_repo.invalidate_submenu_cache, menu_id, submenu['id']
+            )
 
     async def sync_dish(self, menu_id: UUID, submenu_id: UUID, dish: dict) -> None:
         """Синхронизвция определенного блюда"""
@@ -71,63 +108,110 @@ class SynchronizerRepo:
         if (
             db_dish.title != dish['title']
             or db_dish.description != dish['description']
-            or db_dish.price != dish['price']
+            or float(db_dish.price) != dish['price']
         ):
             await self.dish_repo.update_dish(
                 menu_id, submenu_id, dish['id'], DishUpdate(**dish_copy)
             )
+            self.invalidate(
+                self.cache_repo.invalidate_dish_cache, menu_id, submenu_id, dish['id']
+            )
 
     async def sync_dishes(self, menu_id: UUID, submenu_id: UUID, dishes: list) -> None:
         """Синхронизвция всех блюд"""
-        dish_ids = [
-            str(dish.id) for dish in await self.dish_repo.get_all_dishes(submenu_id)
-        ]
+        dish_ids = await self.dish_repo.get_all_dish_ids(submenu_id)
         for dish in dishes:
             if dish['id'] not in dish_ids:
                 await self.dish_repo.create_dish(submenu_id, DishInput(**dish))
+                self.invalidate(
+                    self.cache_repo.invalidate_all_dishes_cache, menu_id, submenu_id
+                )
             else:
                 await self.sync_dish(menu_id, submenu_id, dish)
                 dish_ids.remove(dish['id'])
-            await self.redis.set(dish['id'], pickle.dumps(dish['discount']))
+            self.add_discount(dish)
         for id in dish_ids:
-            await self.dish_repo.delete_dish(menu_id, submenu_id, UUID(id))
+            await self.dish_repo.delete_dish(menu_id, submenu_id, id)
+            self.invalidate(
+                self.cache_repo.invalidate_all_dishes_cache, menu_id, submenu_id
+            )
+            self.invalidate(
+                self.cache_repo.invalidate_dish_cache, menu_id, submenu_id, id
+            )
 
     async def sync_submenus(self, menu_id: UUID, submenus: list) -> None:
         """Синхронизвция всех подменю"""
-        submenu_ids = [
-            str(submenu.id)
-            for submenu in await self.submenu_repo.get_all_submenus(menu_id)
-        ]
+        submenu_ids = await self.submenu_repo.get_all_submenu_ids(menu_id)
         for submenu in submenus:
             if submenu['id'] not in submenu_ids:
                 await self.submenu_repo.create_submenu(menu_id, SubMenuInput(**submenu))
                 await self.create_dishes(submenu['id'], submenu['dishes'])
+                self.invalidate(self.cache_repo.invalidate_all_submenu_cache, menu_id)
             else:
                 await self.sync_submenu(menu_id, submenu)
                 await self.sync_dishes(menu_id, submenu['id'], submenu['dishes'])
                 submenu_ids.remove(submenu['id'])
         for id in submenu_ids:
-            await self.submenu_repo.delete_submenu(menu_id, UUID(id))
+            await self.submenu_repo.delete_submenu(menu_id, id)
+            self.invalidate(self.cache_repo.invalidate_all_submenu_cache, menu_id)
+            self.invalidate(self.cache_repo.invalidate_submenu_tree_cache, menu_id, id)
 
     async def sync_menus(self) -> None:
         """Синхронизвция всех меню"""
-        menu_ids = [str(menu.id) for menu in await self.menu_repo.get_all_menus()]
+        menu_ids = await self.menu_repo.get_all_menu_ids()
         for menu in self.parsed_data:
             if menu['id'] not in menu_ids:
                 await self.menu_repo.create_menu(MenuInput(**menu))
                 await self.create_submenus(menu['id'], menu['submenus'])
                 for submenu in menu['submenus']:
                     await self.create_dishes(submenu['id'], submenu['dishes'])
+                self.invalidate(self.cache_repo.invalidate_menu_cache, menu['id'])
             else:
                 await self.sync_menu(menu)
                 await self.sync_submenus(menu['id'], menu['submenus'])
                 menu_ids.remove(menu['id'])
 
         for id in menu_ids:
-            await self.menu_repo.delete_menu(UUID(id))
+            await self.menu_repo.delete_menu(id)
+            self.invalidate(self.cache_repo.invalidate_menu_cache, id)
+            self.invalidate(self.cache_repo.invalidate_menu_tree_cache, id)
+
+    async def invalidate_cache(self) -> int:
+        """Инвалидация кэша, затронутого изменениями, возвращает число новых версий"""
+        bumped_versions = self.cache_repo.bumped_versions
+        if self.invalidations:
+            self.invalidate(self.cache_repo.invalidate_menus_tree_cache)
+        for invalidate_cache, *args in self.invalidations:
+            invalidate_cache(*args)
+        await self.cache_repo.flush_invalidations()
+        return self.cache_repo.bumped_versions - bumped_versions
+
+    async def save_metrics(self, bumped_versions: int) -> None:
+        """Сохранение метрик синхронизации в redis"""
+        logger.info(
+            'Synchronization bumped %s cache versions in %s operations',
+            bumped_versions,
+            len(self.invalidations),
+        )
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hincrby(SYNC_METRICS_KEY, 'runs_total', 1)
+            pipe.hincrby(SYNC_METRICS_KEY, 'bumped_versions_total', bumped_versions)
+            pipe.hset(
+                SYNC_METRICS_KEY,
+                mapping={
+                    'last_bumped_versions': bumped_versions,
+                    'last_invalidations': len(self.invalidations),
+                },
+            )
+            await pipe.execute()
 
     async def run_synchronization(self) -> None:
         """Запуск синхронизации"""
         await self.initialize_repos()
-        await self.redis.flushall()
+        self.old_discounts = await self.cache_repo.get_all_discounts_cache()
         await self.sync_menus()
+        if self.discounts != self.old_discounts:
+            await self.cache_repo.set_discounts_cache(self.discounts)
+        await self.save_metrics(await self.invalidate_cache())
+        if CACHE_WARM_UP and self.invalidations:
+            await warm_up_cache(self.redis)
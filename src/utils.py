@@ -1,9 +1,19 @@
-from fastapi import Depends, HTTPException, status
-from sqlalchemy import and_, select
+import base64
+import binascii
+import json
+from typing import Any
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, Query, status
+from sqlalchemy import Select, and_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config import PAGE_DEFAULT_LIMIT, PAGE_MAX_LIMIT
 from src.database import get_async_session
 from src.model_definitions.models import Base, Dish, Menu, SubMenu
+from src.schemas.pagination_schemas import DishPage, Page
+
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
 
 
 async def get_menu_by_id(
@@ -66,7 +76,90 @@ def check_if_exists(obj: Base | None, obj_name: str) -> Base:
     return obj
 
 
-def update_dish_price(dish: Dish, discount: int | None) -> None:
+def discounted_price(price: float, discount: int | None) -> float:
+    """Возвращает цену со скидкой в процентах"""
     if discount:
-        price = float(dish.price)
-        dish.price = price - (price * (discount / 100))
+        return price - (price * (discount / 100))
+    return price
+
+
+def apply_discounts(dishes: list[dict], discounts: dict[UUID, int]) -> None:
+    """Применяет скидки к ценам сериализованных блюд"""
+    for dish in dishes:
+        discount = discounts.get(dish['id'])
+        dish['price'] = discounted_price(float(dish['price']), discount)
+
+
+def encode_cursor(title: str, id: UUID | str) -> str:
+    """Курсор страницы, следующей за объектом с title и id"""
+    return base64.urlsafe_b64encode(json.dumps([title, str(id)]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[str, UUID]:
+    """Вызывает HTTPException если курсор не был выдан encode_cursor"""
+    try:
+        title, id = json.loads(base64.urlsafe_b64decode(cursor))
+        return title, UUID(id)
+    except (binascii.Error, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail='invalid cursor',
+        )
+
+
+def next_cursor(items: list[Any], page: Page) -> str | None:
+    """Курсор следующей страницы, если текущая страница заполнена"""
+    if page.limit is None or len(items) < page.limit:
+        return None
+    last = items[-1]
+    if isinstance(last, dict):
+        return encode_cursor(last['title'], last['id'])
+    return encode_cursor(last.title, last.id)
+
+
+def get_page(
+    limit: int | None = Query(None, ge=1, le=PAGE_MAX_LIMIT),
+    cursor: str | None = None,
+    title: str | None = Query(None, min_length=1),
+) -> Page:
+    """Возвращает параметры страницы из query параметров.
+
+    Без limit и cursor список отдается целиком, как до появления страниц.
+    """
+    if limit is None and cursor is not None:
+        limit = PAGE_DEFAULT_LIMIT
+    return Page(
+        limit=limit,
+        cursor=decode_cursor(cursor) if cursor is not None else None,
+        title=title,
+    )
+
+
+def get_dish_page(
+    page: Page = Depends(get_page),
+    price_min: float | None = Query(None, ge=0),
+    price_max: float | None = Query(None, ge=0),
+) -> DishPage:
+    """Возвращает параметры страницы блюд из query параметров"""
+    return DishPage(**page.model_dump(), price_min=price_min, price_max=price_max)
+
+
+def paginate(query: Select, model: type[Base], page: Page) -> Select:
+    """Фильтр по префиксу названия и страница после курсора в порядке (title, id).
+
+    Условия title >= ... позволяют начать чтение индекса по title с нужного места.
+    """
+    if page.title is not None:
+        query = query.where(
+            model.title >= page.title,
+            model.title.startswith(page.title, autoescape=True),
+        )
+    if page.cursor is not None:
+        title, id = page.cursor
+        query = query.where(
+            model.title >= title, or_(model.title > title, model.id > id)
+        )
+    query = query.order_by(model.title, model.id)
+    if page.limit is not None:
+        query = query.limit(page.limit)
+    return query
@@ -25,14 +25,28 @@ async def prepare_database() -> None:
         await conn.run_sync(metadata.create_all)
 
 
-@pytest.fixture(scope='function')
-async def restore_database() -> None:
-    """Фикстура для очистки тестовой базы данных"""
+async def recreate_tables() -> None:
+    """Пересоздание таблиц тестовой базы данных"""
     async with engine_test.begin() as conn:
         await conn.run_sync(metadata.drop_all)
         await conn.run_sync(metadata.create_all)
 
 
+@pytest.fixture(scope='function')
+async def restore_database() -> None:
+    """Фикстура для очистки тестовой базы данных"""
+    await recreate_tables()
+
+
+@pytest.fixture(scope='module')
+def cleanup_database(
+    event_loop: asyncio.AbstractEventLoop,
+) -> Generator[None, None, None]:
+    """Фикстура для очистки тестовой базы данных после тестов модуля"""
+    yield
+    event_loop.run_until_complete(recreate_tables())
+
+
 @pytest.fixture(scope='session')
 async def ac() -> AsyncClient:
     """Фикстура, предоставляющая асинхронный HTTP-клиент (AsyncClient) для тестирования"""
@@ -0,0 +1,18 @@
+from httpx import AsyncClient
+
+from tests.reverse import reverse
+
+
+async def test_metrics(ac: AsyncClient, restore_database):
+    """GET - тест метрик кэша в формате prometheus"""
+    response = await ac.get(reverse('get_menus'))
+    assert response.status_code == 200
+    response = await ac.get(reverse('get_menus'))
+    assert response.status_code == 200
+
+    response = await ac.get('/metrics')
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain')
+    assert 'cache_hits_total{family="menus"' in response.text
+    assert 'cache_misses_total{family="menus"}' in response.text
+    assert 'redis_command_duration_seconds_bucket' in response.text
@@ -0,0 +1,113 @@
+from typing import Generator
+from uuid import UUID
+
+import pytest
+from fastapi import BackgroundTasks, Response
+from httpx import AsyncClient
+
+from src.api.dish.crud_repo import DishCRUDRepo
+from src.api.dish.service_repo import DishServiceRepo
+from src.caching.cache_repo import JSON_MODE, CacheRepo
+from src.caching.local_cache import local_cache
+from src.database import get_redis
+from tests.conftest import SessionMaker
+from tests.reverse import reverse
+
+pytestmark = pytest.mark.usefixtures('cleanup_database')
+
+
+async def set_discounts(discounts: dict[str, int]) -> None:
+    """Замена скидок, как при синхронизации"""
+    await CacheRepo(BackgroundTasks(), get_redis()).set_discounts_cache(discounts)
+
+
+@pytest.fixture
+def json_mode() -> Generator[None, None, None]:
+    """Фикстура, включающая хранение ответов в кэше готовым JSON"""
+    mode = CacheRepo.mode
+    CacheRepo.mode = JSON_MODE
+    yield
+    CacheRepo.mode = mode
+
+
+async def test_create_dish(
+    ac: AsyncClient, restore_database, ids_storage: dict[str, str]
+):
+    """POST - тест создания меню, подменю и блюда"""
+    response = await ac.post(
+        reverse('create_menu'), json={'title': 'm title', 'description': 'm'}
+    )
+    ids_storage['target_menu_id'] = response.json()['id']
+    response = await ac.post(
+        reverse('create_submenu', target_menu_id=ids_storage['target_menu_id']),
+        json={'title': 's title', 'description': 's'},
+    )
+    ids_storage['target_submenu_id'] = response.json()['id']
+    response = await ac.post(
+        reverse('create_dish', **ids_storage),
+        json={'title': 'd title', 'description': 'd', 'price': 100},
+    )
+    assert response.status_code == 201
+    ids_storage['dish_id'] = response.json()['id']
+
+
+async def test_discount_applied_to_cached_tree(
+    ac: AsyncClient, ids_storage: dict[str, str]
+):
+    """GET - тест применения новой скидки к закэшированному дереву меню"""
+    response = await ac.get(reverse('get_menus_tree'))
+    assert response.json()[0]['submenus'][0]['dishes'][0]['price'] == '100.0'
+    etag = response.headers['etag']
+
+    await set_discounts({ids_storage['dish_id']: 10})
+
+    response = await ac.get(reverse('get_menus_tree'), headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.json()[0]['submenus'][0]['dishes'][0]['price'] == '90.0'
+    assert response.headers['etag'] != etag
+
+    response = await ac.get(
+        reverse('get_dish', target_dish_id=ids_storage['dish_id'], **ids_storage)
+    )
+    assert response.json()['price'] == '90.0'
+
+    await set_discounts({})
+
+    response = await ac.get(reverse('get_menus_tree'))
+    assert response.json()[0]['submenus'][0]['dishes'][0]['price'] == '100.0'
+
+
+async def test_zero_discount_is_not_stored(ids_storage: dict[str, str]):
+    """Тест замены скидок, в которой нулевая скидка не хранится в redis"""
+    repo = CacheRepo(BackgroundTasks(), get_redis())
+    await set_discounts({ids_storage['dish_id']: 10})
+    assert await repo.has_discounts()
+
+    await set_discounts({ids_storage['dish_id']: 0})
+    assert not await repo.has_discounts()
+    assert await repo.get_all_discounts_cache() == {}
+
+
+async def test_discounted_dishes_served_as_json(
+    ac: AsyncClient, ids_storage: dict[str, str], json_mode
+):
+    """Тест ответа готовым JSON со скидками и при промахе, и при попадании в кэш"""
+    response = await ac.post(
+        reverse('create_dish', **ids_storage),
+        json={'title': 'json title', 'description': 'd', 'price': 100},
+    )
+    await set_discounts({response.json()['id']: 10})
+    local_cache.clear()
+
+    menu_id = UUID(ids_storage['target_menu_id'])
+    submenu_id = UUID(ids_storage['target_submenu_id'])
+    for _ in range(2):
+        async with SessionMaker() as session:
+            repo = DishServiceRepo(
+                DishCRUDRepo(session), CacheRepo(BackgroundTasks(), get_redis())
+            )
+            result = await repo.get_all_dishes(BackgroundTasks(), menu_id, submenu_id)
+        assert isinstance(result, Response)
+        assert b'"90.0"' in result.body
+
+    await set_discounts({})
@@ -0,0 +1,108 @@
+import asyncio
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from src.caching.cache_repo import GLOBAL_VERSION_KEY, MENU_VERSION_KEY
+from src.caching.local_cache import (
+    INVALIDATION_STREAM,
+    consume_invalidations,
+    local_cache,
+    publish_invalidation,
+)
+from src.caching.warm_up import cache_ready
+from src.database import get_pubsub_redis, get_redis
+from src.main import app
+from tests.reverse import reverse
+
+pytestmark = pytest.mark.usefixtures('cleanup_database')
+
+
+async def test_mutation_publishes_invalidation(ac: AsyncClient, restore_database):
+    """POST - тест публикации инвалидации в поток при создании меню"""
+    response = await ac.post(
+        reverse('create_menu'), json={'title': 'm title', 'description': 'm'}
+    )
+    assert response.status_code == 201
+
+    [(_, fields)] = await get_redis().xrevrange(INVALIDATION_STREAM, count=1)
+    keys = json.loads(fields[b'keys'])
+    assert GLOBAL_VERSION_KEY in keys
+    assert MENU_VERSION_KEY.format(response.json()['id']) in keys
+
+
+async def test_invalidations_are_consumed():
+    """Тест применения инвалидаций из потока к кэшу памяти процесса"""
+    redis = get_pubsub_redis()
+    consumer = asyncio.create_task(consume_invalidations(redis))
+    await asyncio.sleep(0.1)
+    local_cache.set('menus/other-node', 1)
+
+    async with redis.pipeline(transaction=True) as pipe:
+        publish_invalidation(pipe, 'menus/other-node')
+        await pipe.execute()
+    await asyncio.sleep(0.1)
+    consumer.cancel()
+    assert local_cache.get('menus/other-node') is None
+
+
+async def test_consumer_survives_redis_errors():
+    """Тест продолжения чтения инвалидаций после ошибки redis"""
+    redis = get_pubsub_redis()
+    await redis.delete(INVALIDATION_STREAM)
+    await redis.set(INVALIDATION_STREAM, 'not a stream')
+    consumer = asyncio.create_task(consume_invalidations(redis))
+    await asyncio.sleep(0.1)
+    assert not consumer.done()
+
+    await redis.delete(INVALIDATION_STREAM)
+    await asyncio.sleep(1.2)
+    local_cache.set('menus/after-error', 1)
+    async with redis.pipeline(transaction=True) as pipe:
+        publish_invalidation(pipe, 'menus/after-error')
+        await pipe.execute()
+    await asyncio.sleep(0.1)
+    consumer.cancel()
+    assert local_cache.get('menus/after-error') is None
+
+
+async def test_consumer_survives_malformed_invalidation():
+    """Тест очистки кэша и продолжения чтения после неверного события в потоке"""
+    redis = get_pubsub_redis()
+    consumer = asyncio.create_task(consume_invalidations(redis))
+    await asyncio.sleep(0.1)
+    local_cache.set('menus/malformed', 1)
+
+    await redis.xadd(INVALIDATION_STREAM, {'keys': 'not json'})
+    await asyncio.sleep(0.1)
+    assert not consumer.done()
+    assert local_cache.get('menus/malformed') is None
+
+    await asyncio.sleep(1.1)
+    local_cache.set('menus/after-malformed', 1)
+    async with redis.pipeline(transaction=True) as pipe:
+        publish_invalidation(pipe, 'menus/after-malformed')
+        await pipe.execute()
+    await asyncio.sleep(0.1)
+    consumer.cancel()
+    assert local_cache.get('menus/after-malformed') is None
+
+
+async def test_ready_reports_stopped_listener(ac: AsyncClient):
+    """GET - тест ответа 503 на /ready, если подписка на инвалидации остановилась"""
+    listener = asyncio.create_task(asyncio.sleep(0))
+    app.state.invalidation_listener = listener
+    was_ready = cache_ready.is_set()
+    cache_ready.set()
+    try:
+        response = await ac.get('/ready')
+        assert response.status_code == 200
+
+        await listener
+        response = await ac.get('/ready')
+        assert response.status_code == 503
+    finally:
+        del app.state.invalidation_listener
+        if not was_ready:
+            cache_ready.clear()
@@ -0,0 +1,74 @@
+import json
+from typing import Generator
+
+import pytest
+from httpx import AsyncClient
+
+from src.api.menu.crud_repo import MenuCRUDRepo
+from src.api.menu.service_repo import SQL_ENGINE, MenuServiceRepo
+from src.caching.cache_repo import MENUS_TREE_SCHEMA
+from tests.conftest import SessionMaker
+from tests.reverse import reverse
+
+pytestmark = pytest.mark.usefixtures('cleanup_database')
+
+
+@pytest.fixture(scope='module')
+def sql_engine() -> Generator[None, None, None]:
+    """Фикстура, включающая сборку дерева меню в postgres"""
+    tree_engine = MenuServiceRepo.tree_engine
+    MenuServiceRepo.tree_engine = SQL_ENGINE
+    yield
+    MenuServiceRepo.tree_engine = tree_engine
+
+
+async def test_menus_tree_empty(ac: AsyncClient, restore_database, sql_engine):
+    """GET - тест дерева меню из postgres, когда нет ни одного меню"""
+    response = await ac.get(reverse('get_menus_tree'))
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+async def test_menus_tree(ac: AsyncClient, sql_engine, ids_storage: dict[str, str]):
+    """GET - тест дерева меню из postgres со счетчиками и ценами"""
+    response = await ac.post(
+        reverse('create_menu'), json={'title': 'm title', 'description': 'm'}
+    )
+    ids_storage['target_menu_id'] = response.json()['id']
+    response = await ac.post(
+        reverse('create_submenu', **ids_storage),
+        json={'title': 's title', 'description': 's'},
+    )
+    ids_storage['target_submenu_id'] = response.json()['id']
+    for price in (100, 9.9):
+        await ac.post(
+            reverse('create_dish', **ids_storage),
+            json={'title': 'd title', 'description': 'd', 'price': price},
+        )
+
+    response = await ac.get(reverse('get_menus_tree'))
+    assert response.status_code == 200
+    [menu] = response.json()
+    assert menu['submenus_count'] == 1
+    assert menu['dishes_count'] == 2
+    [submenu] = menu['submenus']
+    assert submenu['dishes_count'] == 2
+    assert sorted(dish['price'] for dish in submenu['dishes']) == ['100.0', '9.9']
+
+
+async def test_menus_tree_matches_orm():
+    """Тест совпадения дерева меню из postgres с деревом из ORM объектов"""
+    async with SessionMaker() as session:
+        repo = MenuCRUDRepo(session)
+        sql_tree = json.loads(await repo.get_menus_tree_json())
+        orm_tree = MENUS_TREE_SCHEMA.dump_python(
+            MENUS_TREE_SCHEMA.validate_python(
+                await repo.get_menus_tree(), from_attributes=True
+            ),
+            mode='json',
+        )
+    for menus_tree in (sql_tree, orm_tree):
+        for menu in menus_tree:
+            for submenu in menu['submenus']:
+                submenu['dishes'].sort(key=lambda dish: dish['id'])
+    assert sql_tree == orm_tree
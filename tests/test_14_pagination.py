@@ -0,0 +1,147 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import insert
+
+from src.config import PAGE_DEFAULT_LIMIT
+from src.model_definitions.models import Menu
+from tests.conftest import SessionMaker
+from tests.reverse import reverse
+from tests.test_11_discounts import set_discounts
+
+pytestmark = pytest.mark.usefixtures('cleanup_database')
+
+
+async def test_create_menus(
+    ac: AsyncClient, restore_database, ids_storage: dict[str, str]
+):
+    """POST - тест создания меню с разными названиями"""
+    for title in ('b title', 'a title', 'ab title', 'c title', 'a_title'):
+        response = await ac.post(
+            reverse('create_menu'), json={'title': title, 'description': 'm'}
+        )
+        assert response.status_code == 201
+        ids_storage[title] = response.json()['id']
+
+
+async def test_menus_pages(ac: AsyncClient):
+    """GET - тест обхода меню по страницам курсором"""
+    titles = []
+    params: dict[str, str | int] = {'limit': 2}
+    while True:
+        response = await ac.get(reverse('get_menus'), params=params)
+        assert response.status_code == 200
+        assert len(response.json()) <= 2
+        titles += [menu['title'] for menu in response.json()]
+        if 'x-next-cursor' not in response.headers:
+            break
+        params['cursor'] = response.headers['x-next-cursor']
+    assert titles == ['a title', 'a_title', 'ab title', 'b title', 'c title']
+
+
+async def test_menus_title_prefix(ac: AsyncClient):
+    """GET - тест фильтра меню по началу названия"""
+    response = await ac.get(reverse('get_menus'), params={'title': 'a'})
+    assert [menu['title'] for menu in response.json()] == [
+        'a title',
+        'a_title',
+        'ab title',
+    ]
+    response = await ac.get(reverse('get_menus'), params={'title': 'a_'})
+    assert [menu['title'] for menu in response.json()] == ['a_title']
+
+
+async def test_invalid_page(ac: AsyncClient):
+    """GET - тест ошибки для неверных параметров страницы"""
+    response = await ac.get(reverse('get_menus'), params={'cursor': 'invalid'})
+    assert response.status_code == 422
+    response = await ac.get(reverse('get_menus'), params={'limit': 0})
+    assert response.status_code == 422
+
+
+async def test_page_after_create(ac: AsyncClient):
+    """GET - тест сброса кэша страниц при создании меню"""
+    response = await ac.get(reverse('get_menus'), params={'limit': 1})
+    assert response.json()[0]['title'] == 'a title'
+    await ac.post(reverse('create_menu'), json={'title': '0 title', 'description': 'm'})
+
+    response = await ac.get(reverse('get_menus'), params={'limit': 1})
+    assert response.json()[0]['title'] == '0 title'
+
+
+async def test_dishes_price_range(ac: AsyncClient, ids_storage: dict[str, str]):
+    """GET - тест фильтра блюд по цене"""
+    menu_id = ids_storage['a title']
+    response = await ac.post(
+        reverse('create_submenu', target_menu_id=menu_id),
+        json={'title': 's title', 'description': 's'},
+    )
+    submenu_id = response.json()['id']
+    ids = {'target_menu_id': menu_id, 'target_submenu_id': submenu_id}
+    ids_storage['submenu_id'] = submenu_id
+    for price in (5, 10, 15, 20):
+        response = await ac.post(
+            reverse('create_dish', **ids),
+            json={'title': f'dish {price}', 'description': 'd', 'price': price},
+        )
+        ids_storage[f'dish {price}'] = response.json()['id']
+
+    response = await ac.get(
+        reverse('get_dishes', **ids),
+        params={'price_min': 10, 'price_max': 15},
+    )
+    assert response.status_code == 200
+    assert [dish['price'] for dish in response.json()] == ['10.0', '15.0']
+
+
+async def test_dishes_discounted_price_range(
+    ac: AsyncClient, ids_storage: dict[str, str]
+):
+    """GET - тест фильтра блюд по цене со скидкой"""
+    ids = {
+        'target_menu_id': ids_storage['a title'],
+        'target_submenu_id': ids_storage['submenu_id'],
+    }
+    params = {'price_min': 10, 'price_max': 15}
+    await set_discounts({ids_storage['dish 20']: 50, ids_storage['dish 15']: 10})
+
+    response = await ac.get(reverse('get_dishes', **ids), params=params)
+    await set_discounts({})
+
+    assert response.status_code == 200
+    assert [dish['title'] for dish in response.json()] == [
+        'dish 10',
+        'dish 15',
+        'dish 20',
+    ]
+    assert [dish['price'] for dish in response.json()] == ['10.0', '13.5', '10.0']
+
+    response = await ac.get(reverse('get_dishes', **ids), params=params)
+    assert [dish['price'] for dish in response.json()] == ['10.0', '15.0']
+
+
+async def test_default_page_limit(ac: AsyncClient):
+    """GET - тест полного списка меню без параметров и страницы после курсора"""
+    async with SessionMaker() as session:
+        await session.execute(
+            insert(Menu),
+            [
+                {'title': f'bulk title {m}', 'description': 'm'}
+                for m in range(PAGE_DEFAULT_LIMIT)
+            ],
+        )
+        await session.commit()
+    # создание через API сбрасывает кэш списка меню
+    await ac.post(reverse('create_menu'), json={'title': 'z title', 'description': 'm'})
+
+    response = await ac.get(reverse('get_menus'))
+    assert response.status_code == 200
+    # еще пять меню из test_create_menus, '0 title' и 'z title'
+    assert len(response.json()) == PAGE_DEFAULT_LIMIT + 7
+    assert 'x-next-cursor' not in response.headers
+
+    response = await ac.get(reverse('get_menus'), params={'limit': 1})
+    response = await ac.get(
+        reverse('get_menus'), params={'cursor': response.headers['x-next-cursor']}
+    )
+    assert len(response.json()) == PAGE_DEFAULT_LIMIT
+    assert 'x-next-cursor' in response.headers
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from tests.reverse import reverse
+from tests.test_11_discounts import set_discounts
+
+pytestmark = pytest.mark.usefixtures('cleanup_database')
+
+
+async def test_create_dishes(
+    ac: AsyncClient, restore_database, ids_storage: dict[str, str]
+):
+    """POST - тест создания меню, подменю и двух блюд"""
+    response = await ac.post(
+        reverse('create_menu'), json={'title': 'm title', 'description': 'm'}
+    )
+    ids_storage['target_menu_id'] = response.json()['id']
+    response = await ac.post(
+        reverse('create_submenu', target_menu_id=ids_storage['target_menu_id']),
+        json={'title': 's title', 'description': 's'},
+    )
+    ids_storage['target_submenu_id'] = response.json()['id']
+    for title in ('d1', 'd2'):
+        response = await ac.post(
+            reverse('create_dish', **ids_storage),
+            json={'title': title, 'description': 'd', 'price': 100},
+        )
+        assert response.status_code == 201
+        ids_storage[title] = response.json()['id']
+
+
+async def test_export_catalog(ac: AsyncClient, ids_storage: dict[str, str]):
+    """GET - тест выгрузки каталога в NDJSON со скидками"""
+    await set_discounts({ids_storage['d1']: 10})
+
+    response = await ac.get(reverse('export_catalog'))
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    await set_discounts({})
+
+    assert [line['type'] for line in lines] == ['menu', 'submenu', 'dish', 'dish']
+    assert lines[0]['id'] == ids_storage['target_menu_id']
+    assert lines[0]['dishes_count'] == 2
+    assert lines[1]['menu_id'] == ids_storage['target_menu_id']
+    prices = {line['id']: line['price'] for line in lines[2:]}
+    assert prices == {ids_storage['d1']: '90.0', ids_storage['d2']: '100.0'}
@@ -0,0 +1,67 @@
+from typing import Generator
+
+import pytest
+from fastapi import BackgroundTasks
+from httpx import AsyncClient
+
+from src.caching.cache_repo import LOCK_KEY, MENUS_SCHEMA, CacheRepo
+from src.caching.local_cache import local_cache
+from src.caching.policy import CACHE_POLICIES, MENUS, CachePolicy
+from src.database import engine, get_redis
+from src.model_definitions.models import Menu
+from tests.conftest import SessionMaker, engine_test
+from tests.reverse import reverse
+
+pytestmark = pytest.mark.usefixtures('cleanup_database')
+
+
+@pytest.fixture(scope='module')
+def stale_menus() -> Generator[None, None, None]:
+    """Фикстура, при которой записи меню сразу требуют фонового обновления"""
+    policy = CACHE_POLICIES[MENUS]
+    CACHE_POLICIES[MENUS] = CachePolicy(ttl=0, stale_ttl=60, beta=0)
+    yield
+    CACHE_POLICIES[MENUS] = policy
+
+
+async def test_stale_menus_refreshed_in_own_session(
+    ac: AsyncClient, restore_database, stale_menus
+):
+    """GET - тест фонового обновления устаревшего списка меню на своей сессии бд"""
+    response = await ac.post(
+        reverse('create_menu'), json={'title': 'a title', 'description': 'a'}
+    )
+    assert response.status_code == 201
+    response = await ac.get(reverse('get_menus'))
+    assert [menu['title'] for menu in response.json()] == ['a title']
+
+    async with SessionMaker() as session:
+        session.add(Menu(title='b title', description='b'))
+        await session.commit()
+
+    local_cache.clear()
+    response = await ac.get(reverse('get_menus'))
+    assert [menu['title'] for menu in response.json()] == ['a title']
+    assert engine.pool.checkedout() == 0
+    assert engine_test.pool.checkedout() == 0
+
+    local_cache.clear()
+    response = await ac.get(reverse('get_menus'))
+    assert [menu['title'] for menu in response.json()] == ['a title', 'b title']
+
+
+async def test_lock_ttl_from_policy(monkeypatch: pytest.MonkeyPatch):
+    """Тест блокировки загрузки на время lock_ttl из политики семейства ключей"""
+    monkeypatch.setitem(
+        CACHE_POLICIES, MENUS, CachePolicy(ttl=60, stale_ttl=60, beta=0, lock_ttl=30)
+    )
+    repo = CacheRepo(BackgroundTasks(), get_redis())
+    lock_ttls = []
+
+    async def load() -> list:
+        lock_ttls.append(await repo.redis.ttl(LOCK_KEY.format('menus/lock')))
+        return []
+
+    await repo.load_locked('menus/lock', MENUS, MENUS_SCHEMA, load)
+    assert 20 < lock_ttls[0] <= 30
+    assert not await repo.redis.exists(LOCK_KEY.format('menus/lock'))
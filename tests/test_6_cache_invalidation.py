@@ -0,0 +1,118 @@
+from typing import Generator
+
+import pytest
+from httpx import AsyncClient
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+
+from src.database import get_redis, pool
+from src.main import app
+from tests.reverse import reverse
+
+
+class CountingRedis(Redis):
+    """Клиент redis, считающий обращения к серверу"""
+
+    round_trips = 0
+
+    async def execute_command(self, *args, **options):
+        CountingRedis.round_trips += 1
+        return await super().execute_command(*args, **options)
+
+    def pipeline(self, transaction: bool = True, shard_hint=None) -> Pipeline:
+        CountingRedis.round_trips += 1
+        return super().pipeline(transaction, shard_hint)
+
+
+@pytest.fixture(scope='module')
+def redis_round_trips() -> Generator[type[CountingRedis], None, None]:
+    """Фикстура, подменяющая redis на считающий обращения клиент"""
+    app.dependency_overrides[get_redis] = lambda: CountingRedis(connection_pool=pool)
+    yield CountingRedis
+    del app.dependency_overrides[get_redis]
+
+
+async def assert_one_round_trip(redis: type[CountingRedis], request) -> dict:
+    """Проверка, что изменение инвалидирует кэш за одно обращение к redis"""
+    redis.round_trips = 0
+    response = await request
+    assert response.is_success
+    assert redis.round_trips == 1
+    return response.json()
+
+
+async def test_menu_mutations(
+    ac: AsyncClient, restore_database, redis_round_trips, ids_storage: dict[str, str]
+):
+    """POST, PATCH - тест числа обращений к redis при изменении меню"""
+    data = {'title': 'm title', 'description': 'm description'}
+    menu = await assert_one_round_trip(
+        redis_round_trips, ac.post(reverse('create_menu'), json=data)
+    )
+    ids_storage['menu_id'] = menu['id']
+    await assert_one_round_trip(
+        redis_round_trips,
+        ac.patch(reverse('update_menu', target_menu_id=menu['id']), json=data),
+    )
+
+
+async def test_submenu_mutations(
+    ac: AsyncClient, redis_round_trips, ids_storage: dict[str, str]
+):
+    """POST, PATCH - тест числа обращений к redis при изменении подменю"""
+    data = {'title': 'sm title', 'description': 'sm description'}
+    submenu = await assert_one_round_trip(
+        redis_round_trips,
+        ac.post(
+            reverse('create_submenu', target_menu_id=ids_storage['menu_id']), json=data
+        ),
+    )
+    ids_storage['submenu_id'] = submenu['id']
+    await assert_one_round_trip(
+        redis_round_trips,
+        ac.patch(
+            reverse(
+                'update_submenu',
+                target_menu_id=ids_storage['menu_id'],
+                target_submenu_id=submenu['id'],
+            ),
+            json=data,
+        ),
+    )
+
+
+async def test_dish_mutations(
+    ac: AsyncClient, redis_round_trips, ids_storage: dict[str, str]
+):
+    """POST, PATCH, DELETE - тест числа обращений к redis при изменении блюда"""
+    data = {'title': 'd title', 'description': 'd description', 'price': '1.50'}
+    path_params = {
+        'target_menu_id': ids_storage['menu_id'],
+        'target_submenu_id': ids_storage['submenu_id'],
+    }
+    dish = await assert_one_round_trip(
+        redis_round_trips, ac.post(reverse('create_dish', **path_params), json=data)
+    )
+    dish_url = reverse('update_dish', **path_params, target_dish_id=dish['id'])
+    await assert_one_round_trip(redis_round_trips, ac.patch(dish_url, json=data))
+    await assert_one_round_trip(redis_round_trips, ac.delete(dish_url))
+
+
+async def test_cascade_delete_mutations(
+    ac: AsyncClient, redis_round_trips, ids_storage: dict[str, str]
+):
+    """DELETE - тест числа обращений к redis при каскадном удалении"""
+    await assert_one_round_trip(
+        redis_round_trips,
+        ac.delete(
+            reverse(
+                'delete_submenu',
+                target_menu_id=ids_storage['menu_id'],
+                target_submenu_id=ids_storage['submenu_id'],
+            )
+        ),
+    )
+    await assert_one_round_trip(
+        redis_round_trips,
+        ac.delete(reverse('delete_menu', target_menu_id=ids_storage['menu_id'])),
+    )
@@ -0,0 +1,57 @@
+from httpx import AsyncClient
+
+from tests.reverse import reverse
+
+
+async def test_etag(ac: AsyncClient, restore_database, ids_storage: dict[str, str]):
+    """GET - тест ETag и Last-Modified в ответе"""
+    menu_data = {'title': 'm title', 'description': 'm description'}
+    response = await ac.post(reverse('create_menu'), json=menu_data)
+    assert response.status_code == 201
+    ids_storage['menu_id'] = response.json()['id']
+
+    response = await ac.get(reverse('get_menus'))
+    assert response.status_code == 200
+    assert response.headers['etag']
+    assert response.headers['last-modified']
+    ids_storage['etag'] = response.headers['etag']
+    ids_storage['last_modified'] = response.headers['last-modified']
+
+
+async def test_if_none_match(ac: AsyncClient, ids_storage: dict[str, str]):
+    """GET - тест ответа 304 при совпадении If-None-Match"""
+    response = await ac.get(
+        reverse('get_menus'), headers={'If-None-Match': ids_storage['etag']}
+    )
+    assert response.status_code == 304
+    assert response.content == b''
+    assert response.headers['etag'] == ids_storage['etag']
+
+    response = await ac.get(reverse('get_menus'), headers={'If-None-Match': '"other"'})
+    assert response.status_code == 200
+    assert response.headers['etag'] == ids_storage['etag']
+
+
+async def test_if_modified_since(ac: AsyncClient, ids_storage: dict[str, str]):
+    """GET - тест ответа 304 при If-Modified-Since не раньше Last-Modified"""
+    response = await ac.get(
+        reverse('get_menus'),
+        headers={'If-Modified-Since': ids_storage['last_modified']},
+    )
+    assert response.status_code == 304
+
+
+async def test_etag_after_update(ac: AsyncClient, ids_storage: dict[str, str]):
+    """GET - тест смены ETag после изменения меню"""
+    menu_data = {'title': 'new m title', 'description': 'm description'}
+    response = await ac.patch(
+        reverse('update_menu', target_menu_id=ids_storage['menu_id']), json=menu_data
+    )
+    assert response.status_code == 200
+
+    response = await ac.get(
+        reverse('get_menus'), headers={'If-None-Match': ids_storage['etag']}
+    )
+    assert response.status_code == 200
+    assert response.headers['etag'] != ids_storage['etag']
+    assert response.json()[0]['title'] == 'new m title'
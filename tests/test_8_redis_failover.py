@@ -0,0 +1,86 @@
+from typing import Generator
+
+import pytest
+from httpx import AsyncClient
+from redis.asyncio import ConnectionPool
+from redis.exceptions import ConnectionError
+
+from src.caching.cache_repo import pending_versions
+from src.caching.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerRedis,
+    CircuitOpenError,
+)
+from src.database import get_redis, get_redis_replica
+from src.main import app
+from tests.reverse import reverse
+
+
+async def test_circuit_breaker_opens():
+    """Тест размыкания цепи после нескольких ошибок соединения подряд"""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    calls = 0
+
+    async def unavailable():
+        nonlocal calls
+        calls += 1
+        raise ConnectionError('Redis is unavailable')
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await breaker.call(unavailable)
+    assert breaker.is_open
+
+    with pytest.raises(CircuitOpenError):
+        await breaker.call(unavailable)
+    assert calls == 2
+
+
+async def test_circuit_breaker_closes():
+    """Тест замыкания цепи после успешного пробного запроса"""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.is_open
+
+    async def available():
+        return 'PONG'
+
+    assert await breaker.call(available) == 'PONG'
+    assert not breaker.is_open
+
+
+@pytest.fixture(scope='module')
+def redis_down() -> Generator[None, None, None]:
+    """Фикстура, подменяющая redis на недоступный сервер"""
+    pool = ConnectionPool.from_url('redis://localhost:1', socket_connect_timeout=0.1)
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    unavailable_redis = CircuitBreakerRedis(connection_pool=pool, breaker=breaker)
+    app.dependency_overrides[get_redis] = lambda: unavailable_redis
+    app.dependency_overrides[get_redis_replica] = lambda: unavailable_redis
+    yield
+    del app.dependency_overrides[get_redis]
+    del app.dependency_overrides[get_redis_replica]
+
+
+async def test_menus_without_redis(
+    ac: AsyncClient, restore_database, redis_down, ids_storage: dict[str, str]
+):
+    """Тест работы API из бд при недоступном redis"""
+    menu_data = {'title': 'm title', 'description': 'm description'}
+    response = await ac.post(reverse('create_menu'), json=menu_data)
+    assert response.status_code == 201
+    ids_storage['menu_id'] = response.json()['id']
+    assert pending_versions
+
+    response = await ac.get(reverse('get_menus'))
+    assert response.status_code == 200
+    assert response.json()[0]['id'] == ids_storage['menu_id']
+
+    response = await ac.get(
+        reverse('get_menu', target_menu_id=ids_storage['menu_id'])
+    )
+    assert response.status_code == 200
+    assert response.json()['title'] == 'm title'
+
+    response = await ac.get(reverse('get_menus_tree'))
+    assert response.status_code == 200
@@ -0,0 +1,39 @@
+from uuid import uuid4
+
+from httpx import AsyncClient
+
+from src.caching.cache_repo import negative_cache_metrics
+from tests.reverse import reverse
+
+
+async def test_not_found_is_cached(
+    ac: AsyncClient, restore_database, ids_storage: dict[str, str]
+):
+    """GET - тест кэширования ответа 404 для отсутствующего меню"""
+    ids_storage['menu_id'] = str(uuid4())
+    hits, misses = negative_cache_metrics.hits, negative_cache_metrics.misses
+
+    response = await ac.get(reverse('get_menu', target_menu_id=ids_storage['menu_id']))
+    assert response.status_code == 404
+    assert response.json()['detail'] == 'menu not found'
+    assert negative_cache_metrics.misses == misses + 1
+
+    response = await ac.get(reverse('get_menu', target_menu_id=ids_storage['menu_id']))
+    assert response.status_code == 404
+    assert response.json()['detail'] == 'menu not found'
+    assert negative_cache_metrics.hits == hits + 1
+
+
+async def test_not_found_after_create(ac: AsyncClient, ids_storage: dict[str, str]):
+    """GET - тест сброса кэша 404 при создании меню с тем же id"""
+    menu_data = {
+        'id': ids_storage['menu_id'],
+        'title': 'm title',
+        'description': 'm description',
+    }
+    response = await ac.post(reverse('create_menu'), json=menu_data)
+    assert response.status_code == 201
+
+    response = await ac.get(reverse('get_menu', target_menu_id=ids_storage['menu_id']))
+    assert response.status_code == 200
+    assert response.json()['id'] == ids_storage['menu_id']